@@ -0,0 +1,148 @@
+"""
+Shared fixtures for the Digital Twin Agent tests
+"""
+
+import asyncio
+import mmap
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import List
+
+import pytest
+from dotenv import load_dotenv
+
+RESUME_PATH = Path(__file__).parent / "files" / "BryanWong_Resume_20250710.pdf"
+
+# Every OpenAI readiness check shares one request per model; each check
+# asserts on its own part of the pipe-separated reply
+OPENAI_HEALTH_PROMPT = "Respond with exactly 'ok1|ok2|ok3' and nothing else."
+OPENAI_HEALTH_MODELS = ("gpt-3.5-turbo",)
+
+def pytest_configure(config):
+    # Parse .env once per pytest process; .env never overrides a variable
+    # already set in the environment
+    load_dotenv(override=False)
+
+@dataclass
+class CheckResult:
+    name: str
+    outcome: str
+    msg: str
+    secs: float
+
+# Filled from every test report (including those relayed from xdist workers)
+# and written out as one table at the end of the session
+_results: List[CheckResult] = []
+
+def _report_message(report):
+    if report.passed:
+        return ""
+    if report.skipped:
+        return report.longrepr[2] if isinstance(report.longrepr, tuple) else ""
+    return report.longreprtext.strip().splitlines()[-1]
+
+def pytest_runtest_logreport(report):
+    # One record per test: the call phase, or the setup phase when it did not pass
+    if report.when == "call" or (report.when == "setup" and not report.passed):
+        _results.append(CheckResult(report.nodeid, report.outcome, _report_message(report), report.duration))
+
+def pytest_terminal_summary(terminalreporter):
+    if not _results:
+        return
+    rows = "\n".join(
+        f"{result.name}: {result.outcome.upper()} ({result.secs * 1000:.0f}ms) {result.msg}".rstrip()
+        for result in _results
+    )
+    terminalreporter.write(f"\n{rows}\n")
+
+@lru_cache(maxsize=1)
+def _resume_path():
+    """The resume PDF if it exists; stat()ed once per process"""
+    return RESUME_PATH if RESUME_PATH.is_file() else None
+
+@pytest.fixture(scope="session", params=["fitz", "pypdf"])
+def pdf_backend(request):
+    """PDF text extractor: PyMuPDF as in production, plus PyPDF2 as a regression check"""
+    return request.param
+
+@pytest.fixture(scope="session")
+def resume_extraction(request, pdf_backend):
+    """
+    Resume PDF text and the number of pages skipped as textless, extracted
+    once per session and backend, and reused across runs while the PDF's
+    mtime and size are unchanged
+    """
+    path = _resume_path()
+    if path is None:
+        pytest.skip(f"Resume file not found: {RESUME_PATH}")
+    stat = path.stat()
+    source = f"{stat.st_mtime_ns}-{stat.st_size}"
+    
+    # Stored as JSON under .pytest_cache; a changed PDF invalidates it
+    cache_key = f"resume/extracted/{pdf_backend}"
+    cached = request.config.cache.get(cache_key, None)
+    if cached and cached.get("source") == source:
+        return cached["extraction"]
+    
+    from mcp_server import ResumeParserServer
+    
+    server = ResumeParserServer()
+    if pdf_backend == "fitz":
+        text = server._extract_text_from_pdf(str(path), backend="fitz")
+    else:
+        # Map the PDF rather than reading it: pages are faulted in as the
+        # parser seeks, with no copy of the whole file in Python memory
+        with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            text = server._extract_text_from_pdf_stream(mapped)
+    extraction = {"text": text, "pages_without_text": server.pages_without_text}
+    
+    request.config.cache.set(cache_key, {"source": source, "extraction": extraction})
+    return extraction
+
+@pytest.fixture(scope="session")
+def parsed_resume(resume_extraction):
+    """Structured resume data parsed from the extracted text"""
+    from mcp_server import ResumeParserServer
+    
+    return ResumeParserServer()._parse_resume_text(resume_extraction["text"])
+
+def _openai_client(api_key):
+    """
+    Client for the live checks: a failure surfaces at once instead of after
+    the SDK's and the transport's retries
+    """
+    import httpx
+    import openai
+    
+    return openai.AsyncOpenAI(
+        api_key=api_key,
+        max_retries=0,
+        http_client=httpx.AsyncClient(transport=httpx.AsyncHTTPTransport(retries=0), timeout=10)
+    )
+
+async def _probe_models(api_key):
+    """Send the health prompt to every model concurrently over one client and return the replies by model"""
+    client = _openai_client(api_key)
+    try:
+        responses = await asyncio.gather(*(
+            client.chat.completions.create(
+                model=model,
+                max_tokens=20,
+                messages=[{"role": "user", "content": OPENAI_HEALTH_PROMPT}]
+            )
+            for model in OPENAI_HEALTH_MODELS
+        ))
+    finally:
+        await client.close()
+    return {model: response.choices[0].message.content or "" for model, response in zip(OPENAI_HEALTH_MODELS, responses)}
+
+@pytest.fixture(scope="session")
+def openai_health():
+    """Reply parts by model for the requests shared by the live checks (which skip without a key)"""
+    replies = asyncio.run(_probe_models(os.environ["OPENAI_API_KEY"]))
+    return {
+        model: [part.strip() for part in reply.strip().strip("'\"").split("|")]
+        for model, reply in replies.items()
+    }
\ No newline at end of file
@@ -11,6 +11,7 @@ import uuid
 from pathlib import Path
 from typing import Dict, Any, List, Optional, TypedDict
 from dataclasses import dataclass
+from functools import cached_property
 from datetime import datetime
 
 try:
@@ -49,8 +50,6 @@ class DigitalTwinAgent:
         self.api_key = api_key
         self.user_id = user_id
         self.conversation_id = conversation_id or str(uuid.uuid4())
-        self.client = None
-        self._initialize_openai_client()
         
         # Initialize processors and managers
         self.db = DatabaseManager("digital_twin.db")
@@ -70,12 +69,14 @@ class DigitalTwinAgent:
         self._process_user_data()
         self.graph = self._create_conversation_graph()
     
-    def _initialize_openai_client(self):
-        """Initialize OpenAI client using modern format"""
+    @cached_property
+    def client(self) -> openai.OpenAI:
+        """OpenAI client, created on first use so constructing an agent opens no connections"""
         try:
             http_client = httpx.Client()
-            self.client = openai.OpenAI(api_key=self.api_key, http_client=http_client)
+            client = openai.OpenAI(api_key=self.api_key, http_client=http_client)
             print("✅ OpenAI client initialized successfully")
+            return client
         except Exception as e:
             print(f"❌ Failed to initialize OpenAI client: {e}")
             raise Exception("Could not initialize OpenAI client. Please check your API key.")
@@ -5,8 +5,10 @@ MCP Server for Resume Parsing
 
 import asyncio
 import json
+import re
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import BinaryIO, Callable, Dict, Any, List
+import fitz  # PyMuPDF
 import PyPDF2
 from mcp.server import Server
 from mcp.types import (
@@ -19,11 +21,21 @@ from mcp.types import (
     ReadResourceResult,
 )
 
+# Text-showing operators (Tj, TJ, ' and "), plus Do, which paints an XObject
+# that may be a form with its own text. A page whose content stream has none of
+# them is only drawings, so text extraction is skipped.
+_TEXT_OPERATOR = re.compile(rb"T[jJ]|['\"]|\bDo\b")
+
+# Contact details looked for on each resume line
+_EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+_PHONE_RE = re.compile(r'[\+]?[1-9]?[\d\s\-\(\)]{10,}')
+
 
 class ResumeParserServer:
     def __init__(self):
         self.server = Server("resume-parser")
         self.resume_data = {}
+        self.pages_without_text = 0  # pages skipped by the last extraction
         self._setup_handlers()
 
     def _setup_handlers(self):
@@ -98,18 +110,39 @@ class ResumeParserServer:
             else:
                 raise ValueError(f"Unknown tool: {name}")
 
-    def _extract_text_from_pdf(self, file_path: str) -> str:
-        """Extract text content from PDF file"""
+    def _extract_text_from_pdf(self, file_path: str, backend: str = "fitz") -> str:
+        """Extract text content from PDF file with PyMuPDF ("fitz") or PyPDF2 ("pypdf")"""
         try:
+            if backend == "fitz":
+                self.pages_without_text = 0
+                with fitz.open(file_path) as document:
+                    return "".join(self._page_text(page.read_contents(), page.get_text) + "\n" for page in document)
             with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
-                return text
+                return self._extract_text_from_pdf_stream(file)
         except Exception as e:
             raise Exception(f"Error reading PDF: {str(e)}")
 
+    def _extract_text_from_pdf_stream(self, stream: BinaryIO) -> str:
+        """Extract text content with PyPDF2 from a seekable binary stream, such as an open file or an mmap"""
+        self.pages_without_text = 0
+        pdf_reader = PyPDF2.PdfReader(stream)
+        return "".join(
+            self._page_text(self._page_contents(page), page.extract_text) + "\n"
+            for page in pdf_reader.pages
+        )
+
+    @staticmethod
+    def _page_contents(page: PyPDF2.PageObject) -> bytes:
+        contents = page.get_contents()
+        return contents.get_data() if contents is not None else b""
+
+    def _page_text(self, contents: bytes, extract: Callable[[], str]) -> str:
+        """Text of one page, without running the extractor when its content stream shows no text"""
+        if _TEXT_OPERATOR.search(contents):
+            return extract()
+        self.pages_without_text += 1
+        return ""
+
     def _parse_resume_text(self, text: str) -> Dict[str, Any]:
         """Parse resume text into structured data"""
         lines = [line.strip() for line in text.split('\n') if line.strip()]
@@ -137,15 +170,13 @@ class ResumeParserServer:
             
             # Detect email
             if '@' in line and not resume_data["personal_info"].get("email"):
-                import re
-                email_match = re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', line)
+                email_match = _EMAIL_RE.search(line)
                 if email_match:
                     resume_data["personal_info"]["email"] = email_match.group()
             
             # Detect phone
             if any(char.isdigit() for char in line) and ('phone' in line_lower or '(' in line or '-' in line):
-                import re
-                phone_match = re.search(r'[\+]?[1-9]?[\d\s\-\(\)]{10,}', line)
+                phone_match = _PHONE_RE.search(line)
                 if phone_match:
                     resume_data["personal_info"]["phone"] = phone_match.group().strip()
             
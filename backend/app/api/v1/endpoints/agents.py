@@ -2,17 +2,19 @@
 Agent management endpoints
 """
 
+from datetime import datetime
 from typing import Dict, Any, List, Optional
+from uuid import UUID
 
 import structlog
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Request
 from pydantic import BaseModel
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
-from app.core.security import get_current_active_user
+from app.core.security import get_current_active_user, UserClaims
 from app.services.agent_service import AgentService
 from app.core.exceptions import AgentNotFoundError, ValidationError
 
@@ -54,15 +56,15 @@ class AgentResponse(BaseModel):
     goals: List[str]
     interests: List[str]
     is_active: bool
-    last_conversation_at: Optional[str] = None
+    last_conversation_at: Optional[datetime] = None
     total_conversations: int
-    created_at: str
-    updated_at: str
+    created_at: datetime
+    updated_at: datetime
 
 
 @router.get("/", response_model=List[AgentResponse])
 async def get_user_agents(
-    current_user: Dict[str, Any] = Depends(get_current_active_user),
+    current_user: UserClaims = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -70,7 +72,7 @@ async def get_user_agents(
     """
     try:
         agent_service = AgentService(db)
-        agents = await agent_service.get_agents_by_user_id(current_user["user_id"])
+        agents = await agent_service.get_agents_by_user_id(current_user.user_id)
         
         return [
             AgentResponse(
@@ -84,10 +86,10 @@ async def get_user_agents(
                 goals=agent.goals or [],
                 interests=agent.interests or [],
                 is_active=agent.is_active,
-                last_conversation_at=agent.last_conversation_at.isoformat() if agent.last_conversation_at else None,
+                last_conversation_at=agent.last_conversation_at,
                 total_conversations=agent.total_conversations,
-                created_at=agent.created_at.isoformat(),
-                updated_at=agent.updated_at.isoformat()
+                created_at=agent.created_at,
+                updated_at=agent.updated_at
             )
             for agent in agents
         ]
@@ -103,8 +105,9 @@ async def get_user_agents(
 @router.post("/", response_model=AgentResponse)
 @limiter.limit("5/minute")
 async def create_agent(
+    request: Request,
     agent_request: AgentCreateRequest,
-    current_user: Dict[str, Any] = Depends(get_current_active_user),
+    current_user: UserClaims = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -114,7 +117,7 @@ async def create_agent(
         agent_service = AgentService(db)
         
         agent_data = agent_request.model_dump()
-        agent = await agent_service.create_agent(current_user["user_id"], agent_data)
+        agent = await agent_service.create_agent(current_user.user_id, agent_data)
         
         return AgentResponse(
             id=str(agent.id),
@@ -127,10 +130,10 @@ async def create_agent(
             goals=agent.goals or [],
             interests=agent.interests or [],
             is_active=agent.is_active,
-            last_conversation_at=agent.last_conversation_at.isoformat() if agent.last_conversation_at else None,
+            last_conversation_at=agent.last_conversation_at,
             total_conversations=agent.total_conversations,
-            created_at=agent.created_at.isoformat(),
-            updated_at=agent.updated_at.isoformat()
+            created_at=agent.created_at,
+            updated_at=agent.updated_at
         )
         
     except ValidationError as e:
@@ -145,8 +148,8 @@ async def create_agent(
 
 @router.get("/{agent_id}", response_model=AgentResponse)
 async def get_agent(
-    agent_id: str,
-    current_user: Dict[str, Any] = Depends(get_current_active_user),
+    agent_id: UUID,
+    current_user: UserClaims = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -163,7 +166,7 @@ async def get_agent(
             )
         
         # Verify ownership
-        if str(agent.user_id) != current_user["user_id"]:
+        if agent.user_id != current_user.user_id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="You don't have permission to access this agent"
@@ -180,10 +183,10 @@ async def get_agent(
             goals=agent.goals or [],
             interests=agent.interests or [],
             is_active=agent.is_active,
-            last_conversation_at=agent.last_conversation_at.isoformat() if agent.last_conversation_at else None,
+            last_conversation_at=agent.last_conversation_at,
             total_conversations=agent.total_conversations,
-            created_at=agent.created_at.isoformat(),
-            updated_at=agent.updated_at.isoformat()
+            created_at=agent.created_at,
+            updated_at=agent.updated_at
         )
         
     except HTTPException:
@@ -199,9 +202,10 @@ async def get_agent(
 @router.put("/{agent_id}", response_model=AgentResponse)
 @limiter.limit("10/minute")
 async def update_agent(
-    agent_id: str,
+    request: Request,
+    agent_id: UUID,
     agent_update: AgentUpdateRequest,
-    current_user: Dict[str, Any] = Depends(get_current_active_user),
+    current_user: UserClaims = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -211,7 +215,7 @@ async def update_agent(
         agent_service = AgentService(db)
         
         update_data = agent_update.model_dump(exclude_unset=True)
-        agent = await agent_service.update_agent(agent_id, current_user["user_id"], update_data)
+        agent = await agent_service.update_agent(agent_id, current_user.user_id, update_data)
         
         return AgentResponse(
             id=str(agent.id),
@@ -224,10 +228,10 @@ async def update_agent(
             goals=agent.goals or [],
             interests=agent.interests or [],
             is_active=agent.is_active,
-            last_conversation_at=agent.last_conversation_at.isoformat() if agent.last_conversation_at else None,
+            last_conversation_at=agent.last_conversation_at,
             total_conversations=agent.total_conversations,
-            created_at=agent.created_at.isoformat(),
-            updated_at=agent.updated_at.isoformat()
+            created_at=agent.created_at,
+            updated_at=agent.updated_at
         )
         
     except AgentNotFoundError:
@@ -245,8 +249,9 @@ async def update_agent(
 @router.delete("/{agent_id}")
 @limiter.limit("5/minute")
 async def delete_agent(
-    agent_id: str,
-    current_user: Dict[str, Any] = Depends(get_current_active_user),
+    request: Request,
+    agent_id: UUID,
+    current_user: UserClaims = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -254,7 +259,7 @@ async def delete_agent(
     """
     try:
         agent_service = AgentService(db)
-        await agent_service.delete_agent(agent_id, current_user["user_id"])
+        await agent_service.delete_agent(agent_id, current_user.user_id)
         
         return {"message": "Agent deleted successfully"}
         
@@ -273,8 +278,9 @@ async def delete_agent(
 @router.post("/{agent_id}/activate")
 @limiter.limit("5/minute")
 async def activate_agent(
-    agent_id: str,
-    current_user: Dict[str, Any] = Depends(get_current_active_user),
+    request: Request,
+    agent_id: UUID,
+    current_user: UserClaims = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -282,7 +288,7 @@ async def activate_agent(
     """
     try:
         agent_service = AgentService(db)
-        await agent_service.activate_agent(agent_id, current_user["user_id"])
+        await agent_service.activate_agent(agent_id, current_user.user_id)
         
         return {"message": "Agent activated successfully"}
         
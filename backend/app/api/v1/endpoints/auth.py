@@ -3,10 +3,10 @@ Authentication endpoints
 """
 
 from datetime import timedelta
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 import structlog
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Request
 from pydantic import BaseModel, EmailStr
 from slowapi import Limiter
 from slowapi.util import get_remote_address
@@ -14,7 +14,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import get_settings
 from app.core.database import get_db
-from app.core.security import create_access_token, verify_google_token, get_current_active_user
+from app.core.security import create_access_token, verify_google_token, get_current_active_user, UserClaims
 from app.services.user_service import UserService
 
 logger = structlog.get_logger(__name__)
@@ -40,13 +40,14 @@ class UserInfo(BaseModel):
     id: str
     email: EmailStr
     full_name: str
-    profile_picture_url: str = None
+    profile_picture_url: Optional[str] = None
     created_at: str
 
 
 @router.post("/google", response_model=TokenResponse)
 @limiter.limit("5/minute")
 async def google_auth(
+    request: Request,
     auth_request: GoogleAuthRequest,
     db: AsyncSession = Depends(get_db)
 ):
@@ -103,7 +104,8 @@ async def google_auth(
 @router.post("/refresh")
 @limiter.limit("10/minute")
 async def refresh_token(
-    current_user: Dict[str, Any] = Depends(get_current_active_user)
+    request: Request,
+    current_user: UserClaims = Depends(get_current_active_user)
 ):
     """
     Refresh access token for authenticated user
@@ -114,9 +116,9 @@ async def refresh_token(
         
         access_token = create_access_token(
             data={
-                "sub": current_user["user_id"],
-                "email": current_user["email"],
-                "name": current_user["name"]
+                "sub": str(current_user.user_id),
+                "email": current_user.email,
+                "name": current_user.name
             },
             expires_delta=access_token_expires
         )
@@ -137,7 +139,7 @@ async def refresh_token(
 
 @router.get("/me", response_model=UserInfo)
 async def get_current_user_info(
-    current_user: Dict[str, Any] = Depends(get_current_active_user),
+    current_user: UserClaims = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -145,7 +147,7 @@ async def get_current_user_info(
     """
     try:
         user_service = UserService(db)
-        user = await user_service.get_user_by_id(current_user["user_id"])
+        user = await user_service.get_user_by_id(current_user.user_id)
         
         if not user:
             raise HTTPException(
@@ -171,11 +173,11 @@ async def get_current_user_info(
 
 @router.post("/logout")
 async def logout(
-    current_user: Dict[str, Any] = Depends(get_current_active_user)
+    current_user: UserClaims = Depends(get_current_active_user)
 ):
     """
     Logout current user (client-side token invalidation)
     """
-    logger.info("User logged out", user_id=current_user["user_id"])
+    logger.info("User logged out", user_id=str(current_user.user_id))
     
     return {"message": "Successfully logged out"}
\ No newline at end of file
@@ -2,18 +2,18 @@
 Chat endpoints for WebSocket messaging and conversation management
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, List, Optional
 import uuid
 
 import structlog
-from fastapi import APIRouter, Depends, HTTPException, status, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, Depends, HTTPException, status, WebSocket, WebSocketDisconnect, Request
 from pydantic import BaseModel
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
-from app.core.security import get_current_active_user
+from app.core.security import get_current_active_user, UserClaims
 
 logger = structlog.get_logger(__name__)
 router = APIRouter()
@@ -36,8 +36,9 @@ class MessageCreateRequest(BaseModel):
 @router.post("/conversations")
 @limiter.limit("10/minute")
 async def create_conversation(
+    request: Request,
     conversation_request: ConversationCreateRequest,
-    current_user: Dict[str, Any] = Depends(get_current_active_user),
+    current_user: UserClaims = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -49,7 +50,7 @@ async def create_conversation(
 
 @router.get("/conversations")
 async def get_user_conversations(
-    current_user: Dict[str, Any] = Depends(get_current_active_user),
+    current_user: UserClaims = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -62,7 +63,7 @@ async def get_user_conversations(
 @router.get("/conversations/{conversation_id}/messages")
 async def get_conversation_messages(
     conversation_id: str,
-    current_user: Dict[str, Any] = Depends(get_current_active_user),
+    current_user: UserClaims = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -75,9 +76,10 @@ async def get_conversation_messages(
 @router.post("/conversations/{conversation_id}/messages")
 @limiter.limit("30/minute")
 async def send_message(
+    request: Request,
     conversation_id: str,
     message_request: MessageCreateRequest,
-    current_user: Dict[str, Any] = Depends(get_current_active_user),
+    current_user: UserClaims = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -3,16 +3,20 @@ Social feed endpoints for posts, comments, and voting
 """
 
 from typing import Dict, Any, List, Optional
+from uuid import UUID
 
 import structlog
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
 from pydantic import BaseModel
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
-from app.core.security import get_current_active_user
+from app.core.security import get_current_active_user, UserClaims
+from app.core.exceptions import ValidationError
+from app.models.post import Post, Comment
+from app.services.post_service import PostService
 
 logger = structlog.get_logger(__name__)
 router = APIRouter()
@@ -46,27 +50,93 @@ class VoteRequest(BaseModel):
     vote_type: str  # 'up' or 'down'
 
 
+def _serialize_comment(comment: Comment) -> Dict[str, Any]:
+    """Serialize a comment with its (eager-loaded) author"""
+    return {
+        "id": str(comment.id),
+        "post_id": str(comment.post_id),
+        "parent_comment_id": str(comment.parent_comment_id) if comment.parent_comment_id else None,
+        "author": {"id": str(comment.user.id), "full_name": comment.user.full_name},
+        "content": comment.content,
+        "upvotes": comment.upvotes,
+        "downvotes": comment.downvotes,
+        "created_at": comment.created_at.isoformat()
+    }
+
+
+def _serialize_post(post: Post, include_comments: bool = False) -> Dict[str, Any]:
+    """Serialize a post with its (eager-loaded) author"""
+    data = {
+        "id": str(post.id),
+        "author": {
+            "id": str(post.user.id),
+            "full_name": post.user.full_name,
+            "profile_picture_url": post.user.profile_picture_url
+        },
+        "title": post.title,
+        "content": post.content,
+        "post_type": post.post_type,
+        "tags": post.tags or [],
+        "upvotes": post.upvotes,
+        "downvotes": post.downvotes,
+        "comment_count": post.comment_count,
+        "is_pinned": post.is_pinned,
+        "created_at": post.created_at.isoformat(),
+        "updated_at": post.updated_at.isoformat()
+    }
+    if include_comments:
+        data["comments"] = [_serialize_comment(comment) for comment in post.comments]
+    return data
+
+
 @router.get("/posts")
 async def get_feed_posts(
+    cursor: Optional[str] = Query(None),
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
     sort: str = Query("recent", regex="^(recent|trending|top)$"),
     tags: Optional[str] = Query(None),
-    current_user: Dict[str, Any] = Depends(get_current_active_user),
+    current_user: UserClaims = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Get posts for the social feed
-    """
-    # TODO: Implement post retrieval with sorting and filtering
-    return {"posts": [], "total": 0, "skip": skip, "limit": limit}
+    
+    Recent posts are paginated with the opaque next_cursor; ranked sorts use skip.
+    """
+    try:
+        post_service = PostService(db)
+        tag_list = [tag.strip() for tag in tags.split(",")] if tags else None
+        
+        next_cursor = None
+        if sort == "recent":
+            posts, next_cursor = await post_service.list_posts(cursor=cursor, limit=limit, tags=tag_list)
+        else:
+            posts = await post_service.get_feed_posts(skip=skip, limit=limit, tags=tag_list)
+        
+        return {
+            "posts": [_serialize_post(post) for post in posts],
+            "next_cursor": next_cursor,
+            "skip": skip,
+            "limit": limit
+        }
+        
+    except ValidationError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+    except Exception as e:
+        logger.error("Failed to get feed posts", error=str(e))
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to get posts"
+        )
 
 
 @router.post("/posts")
 @limiter.limit("10/hour")
 async def create_post(
+    request: Request,
     post_request: PostCreateRequest,
-    current_user: Dict[str, Any] = Depends(get_current_active_user),
+    current_user: UserClaims = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -78,23 +148,42 @@ async def create_post(
 
 @router.get("/posts/{post_id}")
 async def get_post(
-    post_id: str,
-    current_user: Dict[str, Any] = Depends(get_current_active_user),
+    post_id: UUID,
+    current_user: UserClaims = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Get a specific post with comments
     """
-    # TODO: Implement single post retrieval
-    return {"post": None}
+    try:
+        post_service = PostService(db)
+        post = await post_service.get_post_by_id(post_id)
+        
+        if not post:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Post not found"
+            )
+        
+        return {"post": _serialize_post(post, include_comments=True)}
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Failed to get post", error=str(e))
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to get post"
+        )
 
 
 @router.put("/posts/{post_id}")
 @limiter.limit("20/hour")
 async def update_post(
-    post_id: str,
+    request: Request,
+    post_id: UUID,
     post_update: PostUpdateRequest,
-    current_user: Dict[str, Any] = Depends(get_current_active_user),
+    current_user: UserClaims = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -107,8 +196,9 @@ async def update_post(
 @router.delete("/posts/{post_id}")
 @limiter.limit("10/hour")
 async def delete_post(
-    post_id: str,
-    current_user: Dict[str, Any] = Depends(get_current_active_user),
+    request: Request,
+    post_id: UUID,
+    current_user: UserClaims = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -121,9 +211,10 @@ async def delete_post(
 @router.post("/posts/{post_id}/vote")
 @limiter.limit("100/hour")
 async def vote_on_post(
-    post_id: str,
+    request: Request,
+    post_id: UUID,
     vote_request: VoteRequest,
-    current_user: Dict[str, Any] = Depends(get_current_active_user),
+    current_user: UserClaims = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -136,9 +227,10 @@ async def vote_on_post(
 @router.post("/posts/{post_id}/comments")
 @limiter.limit("50/hour")
 async def create_comment(
-    post_id: str,
+    request: Request,
+    post_id: UUID,
     comment_request: CommentCreateRequest,
-    current_user: Dict[str, Any] = Depends(get_current_active_user),
+    current_user: UserClaims = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -150,10 +242,10 @@ async def create_comment(
 
 @router.get("/posts/{post_id}/comments")
 async def get_post_comments(
-    post_id: str,
+    post_id: UUID,
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
-    current_user: Dict[str, Any] = Depends(get_current_active_user),
+    current_user: UserClaims = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -2,17 +2,17 @@
 Matchmaking endpoints for agent-driven user matching
 """
 
-from typing import Dict, Any, List, Optional
+from typing import List, Optional
 
 import structlog
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
 from pydantic import BaseModel
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
-from app.core.security import get_current_active_user
+from app.core.security import get_current_active_user, UserClaims
 
 logger = structlog.get_logger(__name__)
 router = APIRouter()
@@ -43,7 +43,7 @@ async def get_user_matches(
     status: Optional[str] = Query(None, regex="^(pending|accepted|rejected|expired)$"),
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
-    current_user: Dict[str, Any] = Depends(get_current_active_user),
+    current_user: UserClaims = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -56,7 +56,7 @@ async def get_user_matches(
 @router.get("/{match_id}", response_model=MatchResponse)
 async def get_match(
     match_id: str,
-    current_user: Dict[str, Any] = Depends(get_current_active_user),
+    current_user: UserClaims = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -69,9 +69,10 @@ async def get_match(
 @router.post("/{match_id}/respond")
 @limiter.limit("20/hour")
 async def respond_to_match(
+    request: Request,
     match_id: str,
     response_request: MatchResponseRequest,
-    current_user: Dict[str, Any] = Depends(get_current_active_user),
+    current_user: UserClaims = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -84,7 +85,8 @@ async def respond_to_match(
 @router.post("/discover")
 @limiter.limit("5/hour")
 async def discover_matches(
-    current_user: Dict[str, Any] = Depends(get_current_active_user),
+    request: Request,
+    current_user: UserClaims = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -5,14 +5,14 @@ Notification endpoints
 from typing import Dict, Any, List, Optional
 
 import structlog
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
 from pydantic import BaseModel
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
-from app.core.security import get_current_active_user
+from app.core.security import get_current_active_user, UserClaims
 
 logger = structlog.get_logger(__name__)
 router = APIRouter()
@@ -35,7 +35,7 @@ async def get_notifications(
     is_read: Optional[bool] = Query(None),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
-    current_user: Dict[str, Any] = Depends(get_current_active_user),
+    current_user: UserClaims = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -48,8 +48,9 @@ async def get_notifications(
 @router.post("/{notification_id}/mark-read")
 @limiter.limit("100/hour")
 async def mark_notification_read(
+    request: Request,
     notification_id: str,
-    current_user: Dict[str, Any] = Depends(get_current_active_user),
+    current_user: UserClaims = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -62,7 +63,8 @@ async def mark_notification_read(
 @router.post("/mark-all-read")
 @limiter.limit("10/hour")
 async def mark_all_notifications_read(
-    current_user: Dict[str, Any] = Depends(get_current_active_user),
+    request: Request,
+    current_user: UserClaims = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -74,7 +76,7 @@ async def mark_all_notifications_read(
 
 @router.get("/unread-count")
 async def get_unread_count(
-    current_user: Dict[str, Any] = Depends(get_current_active_user),
+    current_user: UserClaims = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -6,14 +6,14 @@ from typing import Dict, Any, List, Optional
 import uuid
 
 import structlog
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Request
 from pydantic import BaseModel, EmailStr
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
-from app.core.security import get_current_active_user
+from app.core.security import get_current_active_user, UserClaims
 from app.services.user_service import UserService
 
 logger = structlog.get_logger(__name__)
@@ -56,7 +56,7 @@ class PrivacySettingsUpdate(BaseModel):
 
 @router.get("/profile", response_model=UserProfileResponse)
 async def get_user_profile(
-    current_user: Dict[str, Any] = Depends(get_current_active_user),
+    current_user: UserClaims = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -64,7 +64,7 @@ async def get_user_profile(
     """
     try:
         user_service = UserService(db)
-        user = await user_service.get_user_by_id(current_user["user_id"])
+        user = await user_service.get_user_by_id(current_user.user_id)
         
         if not user:
             raise HTTPException(
@@ -99,8 +99,9 @@ async def get_user_profile(
 @router.put("/profile", response_model=UserProfileResponse)
 @limiter.limit("10/minute")
 async def update_user_profile(
+    request: Request,
     profile_update: UserProfileUpdate,
-    current_user: Dict[str, Any] = Depends(get_current_active_user),
+    current_user: UserClaims = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -112,7 +113,7 @@ async def update_user_profile(
         # Only include non-None values
         update_data = profile_update.model_dump(exclude_unset=True)
         
-        user = await user_service.update_user(current_user["user_id"], update_data)
+        user = await user_service.update_user(current_user.user_id, update_data)
         
         return UserProfileResponse(
             id=str(user.id),
@@ -141,8 +142,9 @@ async def update_user_profile(
 @router.put("/privacy-settings")
 @limiter.limit("5/minute")
 async def update_privacy_settings(
+    request: Request,
     privacy_update: PrivacySettingsUpdate,
-    current_user: Dict[str, Any] = Depends(get_current_active_user),
+    current_user: UserClaims = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -150,7 +152,7 @@ async def update_privacy_settings(
     """
     try:
         user_service = UserService(db)
-        user = await user_service.get_user_by_id(current_user["user_id"])
+        user = await user_service.get_user_by_id(current_user.user_id)
         
         if not user:
             raise HTTPException(
@@ -166,7 +168,7 @@ async def update_privacy_settings(
             current_settings[key] = value
         
         updated_user = await user_service.update_user(
-            current_user["user_id"], 
+            current_user.user_id, 
             {"privacy_settings": current_settings}
         )
         
@@ -182,8 +184,8 @@ async def update_privacy_settings(
 
 @router.get("/{user_id}/profile", response_model=UserProfileResponse)
 async def get_public_user_profile(
-    user_id: str,
-    current_user: Dict[str, Any] = Depends(get_current_active_user),
+    user_id: uuid.UUID,
+    current_user: UserClaims = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -236,7 +238,8 @@ async def get_public_user_profile(
 @router.post("/deactivate")
 @limiter.limit("2/hour")
 async def deactivate_account(
-    current_user: Dict[str, Any] = Depends(get_current_active_user),
+    request: Request,
+    current_user: UserClaims = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -244,9 +247,9 @@ async def deactivate_account(
     """
     try:
         user_service = UserService(db)
-        await user_service.deactivate_user(current_user["user_id"])
+        await user_service.deactivate_user(current_user.user_id)
         
-        logger.info("User account deactivated", user_id=current_user["user_id"])
+        logger.info("User account deactivated", user_id=str(current_user.user_id))
         return {"message": "Account deactivated successfully"}
         
     except Exception as e:
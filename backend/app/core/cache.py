@@ -0,0 +1,208 @@
+"""
+Redis read-through cache for ORM rows
+"""
+
+import asyncio
+import json
+import uuid
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Type, TypeVar, Union
+
+import structlog
+from sqlalchemy import DateTime, inspect
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.core.redis import redis_manager
+
+if TYPE_CHECKING:
+    from app.core.database import Base
+
+logger = structlog.get_logger(__name__)
+
+ModelT = TypeVar("ModelT", bound="Base")
+
+DEFAULT_TTL = 300  # seconds
+
+_PENDING_INVALIDATIONS = "cache_invalidations"
+
+# Postgres channel the users/agents triggers publish row changes on
+INVALIDATION_CHANNEL = "cache_invalidation"
+
+# Backoff between attempts to re-establish a lost invalidation listener
+_LISTEN_RETRY_MIN = 1  # seconds
+_LISTEN_RETRY_MAX = 30  # seconds
+
+
+def user_id_key(user_id: Union[uuid.UUID, str]) -> str:
+    return f"user:id:{user_id}"
+
+
+def user_google_key(google_id: str) -> str:
+    return f"user:google:{google_id}"
+
+
+def agent_id_key(agent_id: Union[uuid.UUID, str]) -> str:
+    return f"agent:id:{agent_id}"
+
+
+def embedding_version_key(entity_id: Union[uuid.UUID, str]) -> str:
+    """Counter bumped whenever an entity's embedding changes"""
+    return f"embedding:version:{entity_id}"
+
+
+def embedding_source_key(entity_type: str, entity_id: Union[uuid.UUID, str]) -> str:
+    """Digest of the text an entity's stored embedding was generated from"""
+    return f"embedding:source:{entity_type}:{entity_id}"
+
+
+def _encode_row(obj: "Base") -> str:
+    """Serialize the column values of an ORM instance to JSON"""
+    row = {}
+    for attr in inspect(obj).mapper.column_attrs:
+        value = getattr(obj, attr.key)
+        if isinstance(value, uuid.UUID):
+            value = str(value)
+        elif isinstance(value, datetime):
+            value = value.isoformat()
+        row[attr.key] = value
+    return json.dumps(row)
+
+
+def _decode_row(model: Type[ModelT], payload: str) -> Dict[str, Any]:
+    """Deserialize a cached JSON row, restoring UUID and datetime columns"""
+    row = json.loads(payload)
+    for attr in inspect(model).column_attrs:
+        value = row.get(attr.key)
+        if value is None:
+            continue
+        column_type = attr.columns[0].type
+        if isinstance(column_type, UUID):
+            row[attr.key] = uuid.UUID(value)
+        elif isinstance(column_type, DateTime):
+            row[attr.key] = datetime.fromisoformat(value)
+    return row
+
+
+async def get_cached(db: AsyncSession, model: Type[ModelT], key: str) -> Optional[ModelT]:
+    """Return the cached row for key attached to the session, or None on a miss"""
+    client = redis_manager.client
+    if client is None:
+        return None
+
+    try:
+        payload = await client.get(key)
+    except Exception as e:
+        logger.warning("Cache read failed", key=key, error=str(e))
+        return None
+
+    if payload is None:
+        return None
+
+    # Rebuild a persistent instance without a SELECT; changes made by the
+    # caller are flushed as a normal UPDATE
+    obj = model(**_decode_row(model, payload))
+    make_transient_to_detached(obj)
+    return await db.merge(obj, load=False)
+
+
+async def set_cached(obj: "Base", *keys: str, ttl: int = DEFAULT_TTL) -> None:
+    """Cache the column values of obj under each key"""
+    client = redis_manager.client
+    if client is None or not keys:
+        return
+
+    payload = _encode_row(obj)
+    try:
+        async with client.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.set(key, payload, ex=ttl)
+            await pipe.execute()
+    except Exception as e:
+        logger.warning("Cache write failed", keys=keys, error=str(e))
+
+
+async def invalidate(*keys: str) -> None:
+    """Drop cached rows for the given keys"""
+    client = redis_manager.client
+    if client is None or not keys:
+        return
+
+    try:
+        await client.delete(*keys)
+    except Exception as e:
+        logger.warning("Cache invalidation failed", keys=keys, error=str(e))
+
+
+def invalidate_on_commit(db: AsyncSession, *keys: str) -> None:
+    """Queue keys to be dropped once the session's transaction commits"""
+    db.info.setdefault(_PENDING_INVALIDATIONS, set()).update(keys)
+
+
+async def flush_invalidations(db: AsyncSession) -> None:
+    """Drop keys queued with invalidate_on_commit; call after a successful commit"""
+    keys = db.info.pop(_PENDING_INVALIDATIONS, None)
+    if keys:
+        await invalidate(*keys)
+
+
+def discard_invalidations(db: AsyncSession) -> None:
+    """Forget keys queued with invalidate_on_commit after a rollback"""
+    db.info.pop(_PENDING_INVALIDATIONS, None)
+
+
+def _keys_for_change(payload: str) -> List[str]:
+    """Map a change notification from the database to the cache keys it affects"""
+    change = json.loads(payload)
+    if change["table"] == "users":
+        return [user_id_key(change["id"]), user_google_key(change["google_id"])]
+    if change["table"] == "agents":
+        return [agent_id_key(change["id"])]
+    return []
+
+
+async def listen_for_invalidations(engine: AsyncEngine) -> None:
+    """
+    Drop cached rows whenever Postgres reports a change to them
+
+    Covers writes that bypass the services (Supabase clients, SQL, other
+    replicas mid-deploy). Holds one pooled connection until cancelled and
+    reconnects with backoff when it is lost; changes made while disconnected
+    are only dropped when their entries expire.
+    """
+    pending: Set[asyncio.Task] = set()
+
+    def on_notification(connection, pid, channel, payload) -> None:
+        try:
+            keys = _keys_for_change(payload)
+        except (ValueError, KeyError) as e:
+            logger.warning("Malformed cache invalidation", payload=payload, error=str(e))
+            return
+        task = asyncio.create_task(invalidate(*keys))
+        pending.add(task)
+        task.add_done_callback(pending.discard)
+
+    delay = _LISTEN_RETRY_MIN
+    while True:
+        try:
+            async with engine.connect() as conn:
+                raw_connection = await conn.get_raw_connection()
+                listener = raw_connection.driver_connection
+                lost = asyncio.Event()
+                listener.add_termination_listener(lambda connection: lost.set())
+                await listener.add_listener(INVALIDATION_CHANNEL, on_notification)
+                logger.info("Listening for cache invalidations", channel=INVALIDATION_CHANNEL)
+                delay = _LISTEN_RETRY_MIN
+                try:
+                    await lost.wait()
+                finally:
+                    if not listener.is_closed():
+                        await listener.remove_listener(INVALIDATION_CHANNEL, on_notification)
+                # Don't hand the dead connection back to the pool
+                await conn.invalidate()
+            logger.warning("Cache invalidation listener lost its connection", retry_in=delay)
+        except Exception as e:
+            logger.warning("Cache invalidation listener failed", error=str(e), retry_in=delay)
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, _LISTEN_RETRY_MAX)
@@ -16,7 +16,8 @@ celery_app = Celery(
         "app.tasks.agent_tasks",
         "app.tasks.matchmaking_tasks",
         "app.tasks.notification_tasks",
-        "app.tasks.vector_tasks"
+        "app.tasks.vector_tasks",
+        "app.tasks.worker_db"
     ]
 )
 
@@ -6,88 +6,93 @@ import os
 from functools import lru_cache
 from typing import List, Optional
 
-from pydantic import Field, validator
-from pydantic_settings import BaseSettings
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+def _split_comma_separated(value: str) -> List[str]:
+    return [item.strip() for item in value.split(",")]
 
 
 class Settings(BaseSettings):
     """Application settings"""
     
+    model_config = SettingsConfigDict(env_file=".env", case_sensitive=False, extra="ignore")
+    
     # Environment
-    environment: str = Field(default="development", env="ENVIRONMENT")
-    debug: bool = Field(default=False, env="DEBUG")
+    environment: str = Field(default="development")
+    debug: bool = Field(default=False)
     
     # Server configuration
-    host: str = Field(default="0.0.0.0", env="HOST")
-    port: int = Field(default=8000, env="PORT")
-    log_level: str = Field(default="INFO", env="LOG_LEVEL")
+    host: str = Field(default="0.0.0.0")
+    port: int = Field(default=8000)
+    log_level: str = Field(default="INFO")
     
     # Security
-    secret_key: str = Field(..., env="SECRET_KEY")
-    algorithm: str = Field(default="HS256", env="ALGORITHM")
-    access_token_expire_minutes: int = Field(default=30, env="ACCESS_TOKEN_EXPIRE_MINUTES")
-    
-    # CORS
-    allowed_origins: List[str] = Field(
-        default=["http://localhost:3000", "http://localhost:5173"],
-        env="ALLOWED_ORIGINS"
+    secret_key: str = Field(...)
+    algorithm: str = Field(default="HS256")
+    access_token_expire_minutes: int = Field(default=30)
+    
+    # CORS (comma-separated; read through allowed_origins)
+    allowed_origins_csv: str = Field(
+        default="http://localhost:3000,http://localhost:5173",
+        validation_alias="allowed_origins"
     )
     
     # Database
-    database_url: str = Field(..., env="DATABASE_URL")
-    supabase_url: str = Field(..., env="SUPABASE_URL")
-    supabase_key: str = Field(..., env="SUPABASE_KEY")
+    database_url: str = Field(...)
+    supabase_url: str = Field(...)
+    supabase_key: str = Field(...)
     
     # Redis
-    redis_url: str = Field(default="redis://localhost:6379", env="REDIS_URL")
+    redis_url: str = Field(default="redis://localhost:6379")
+    redis_pool_size: int = Field(default=50)
     
     # Google OAuth
-    google_client_id: str = Field(..., env="GOOGLE_CLIENT_ID")
-    google_client_secret: str = Field(..., env="GOOGLE_CLIENT_SECRET")
+    google_client_id: str = Field(...)
+    google_client_secret: str = Field(...)
     
     # OpenAI
-    openai_api_key: str = Field(..., env="OPENAI_API_KEY")
-    openai_model: str = Field(default="gpt-3.5-turbo", env="OPENAI_MODEL")
-    openai_embedding_model: str = Field(default="text-embedding-ada-002", env="OPENAI_EMBEDDING_MODEL")
+    openai_api_key: str = Field(...)
+    openai_model: str = Field(default="gpt-3.5-turbo")
+    openai_embedding_model: str = Field(default="text-embedding-ada-002")
+    openai_embed_batch_size: int = Field(default=1024)  # texts per embeddings request
+    vector_max_concurrency: int = Field(default=5)  # in-flight OpenAI/Pinecone requests per batch
+    embedding_cache_ttl: int = Field(default=30 * 24 * 3600)  # seconds
     
     # Pinecone
-    pinecone_api_key: str = Field(..., env="PINECONE_API_KEY")
-    pinecone_environment: str = Field(..., env="PINECONE_ENVIRONMENT")
-    pinecone_index_name: str = Field(default="digital-twin-embeddings", env="PINECONE_INDEX_NAME")
+    pinecone_api_key: str = Field(...)
+    pinecone_environment: str = Field(...)
+    pinecone_index_name: str = Field(default="digital-twin-embeddings")
+    pinecone_transport: str = Field(default="grpc")  # 'rest' or 'grpc'
+    vector_backend: str = Field(default="pinecone")  # 'pinecone', or 'faiss' for an in-process index
     
     # Celery
-    celery_broker_url: str = Field(default="redis://localhost:6379/1", env="CELERY_BROKER_URL")
-    celery_result_backend: str = Field(default="redis://localhost:6379/2", env="CELERY_RESULT_BACKEND")
+    celery_broker_url: str = Field(default="redis://localhost:6379/1")
+    celery_result_backend: str = Field(default="redis://localhost:6379/2")
     
     # File storage
-    upload_max_size: int = Field(default=10 * 1024 * 1024, env="UPLOAD_MAX_SIZE")  # 10MB
-    allowed_file_types: List[str] = Field(
-        default=["application/pdf", "image/jpeg", "image/png"],
-        env="ALLOWED_FILE_TYPES"
+    upload_max_size: int = Field(default=10 * 1024 * 1024)  # 10MB
+    allowed_file_types_csv: str = Field(
+        default="application/pdf,image/jpeg,image/png",
+        validation_alias="allowed_file_types"
     )
     
     # Rate limiting
-    rate_limit_requests: int = Field(default=100, env="RATE_LIMIT_REQUESTS")
-    rate_limit_period: int = Field(default=60, env="RATE_LIMIT_PERIOD")  # seconds
+    rate_limit_requests: int = Field(default=100)
+    rate_limit_period: int = Field(default=60)  # seconds
     
     # Monitoring
-    sentry_dsn: Optional[str] = Field(default=None, env="SENTRY_DSN")
-    
-    @validator("allowed_origins", pre=True)
-    def parse_origins(cls, v):
-        if isinstance(v, str):
-            return [origin.strip() for origin in v.split(",")]
-        return v
-    
-    @validator("allowed_file_types", pre=True)
-    def parse_file_types(cls, v):
-        if isinstance(v, str):
-            return [file_type.strip() for file_type in v.split(",")]
-        return v
-    
-    class Config:
-        env_file = ".env"
-        case_sensitive = False
+    sentry_dsn: Optional[str] = Field(default=None)
+    
+    # Declared as str so pydantic-settings doesn't JSON-decode the env value
+    @property
+    def allowed_origins(self) -> List[str]:
+        return _split_comma_separated(self.allowed_origins_csv)
+    
+    @property
+    def allowed_file_types(self) -> List[str]:
+        return _split_comma_separated(self.allowed_file_types_csv)
 
 
 @lru_cache()
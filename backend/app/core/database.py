@@ -2,21 +2,37 @@
 Database connection and session management
 """
 
-from typing import AsyncGenerator, Optional
+from typing import TYPE_CHECKING, AsyncGenerator, Optional, Tuple
 
 import structlog
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
-from supabase import create_client, Client
 
 from app.core.config import get_settings
+from app.core.cache import discard_invalidations, flush_invalidations
+
+if TYPE_CHECKING:
+    from supabase import Client
 
 logger = structlog.get_logger(__name__)
 
 
 class Base(DeclarativeBase):
     """Base class for SQLAlchemy models"""
-    pass
+    
+    # Extra column attributes rendered by __repr__ in debug mode
+    __repr_attrs__: Tuple[str, ...] = ()
+    
+    def __repr__(self) -> str:
+        # Outside debug only the primary key is rendered, so logging bulk
+        # query results never touches (or lazy-loads) other attributes
+        if not get_settings().debug:
+            return f"<{type(self).__name__}(id={self.id})>"
+        
+        fields = ", ".join(
+            f"{name}={getattr(self, name)}" for name in ("id", *self.__repr_attrs__)
+        )
+        return f"<{type(self).__name__}({fields})>"
 
 
 class DatabaseManager:
@@ -25,12 +41,16 @@ class DatabaseManager:
     def __init__(self):
         self.engine = None
         self.session_factory = None
-        self.supabase_client: Optional[Client] = None
+        self.supabase_client: Optional["Client"] = None
     
     async def connect(self):
         """Initialize database connections"""
         settings = get_settings()
         
+        # Register every model so relationship targets resolve at mapper configuration
+        from app.models import load_all
+        load_all()
+        
         # SQLAlchemy async engine
         self.engine = create_async_engine(
             settings.database_url,
@@ -45,12 +65,6 @@ class DatabaseManager:
             expire_on_commit=False,
         )
         
-        # Supabase client
-        self.supabase_client = create_client(
-            settings.supabase_url,
-            settings.supabase_key
-        )
-        
         logger.info("Database connections initialized")
     
     async def disconnect(self):
@@ -64,19 +78,31 @@ class DatabaseManager:
         if not self.session_factory:
             raise RuntimeError("Database not initialized")
         
+        # One transaction per request: services flush, the session commits here
         async with self.session_factory() as session:
             try:
                 yield session
+                await session.commit()
             except Exception:
                 await session.rollback()
+                discard_invalidations(session)
                 raise
             finally:
                 await session.close()
+            
+            await flush_invalidations(session)
     
-    def get_supabase(self) -> Client:
-        """Get Supabase client"""
-        if not self.supabase_client:
-            raise RuntimeError("Supabase client not initialized")
+    def get_supabase(self) -> "Client":
+        """Get Supabase client, creating it on first use"""
+        if self.supabase_client is None:
+            # Deferred: supabase-py is heavy and most workers never need it
+            from supabase import create_client
+            
+            settings = get_settings()
+            self.supabase_client = create_client(
+                settings.supabase_url,
+                settings.supabase_key
+            )
         return self.supabase_client
 
 
@@ -90,6 +116,6 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
-def get_supabase() -> Client:
+def get_supabase() -> "Client":
     """Dependency to get Supabase client"""
     return database_manager.get_supabase()
\ No newline at end of file
@@ -5,31 +5,50 @@ Redis connection and utilities
 from typing import Optional
 import redis.asyncio as redis
 import structlog
+from redis.commands.core import AsyncScript
 
 from app.core.config import get_settings
 
 logger = structlog.get_logger(__name__)
 
+# Atomic fixed-window counter: INCR the key and start its TTL on first hit
+RATE_LIMIT_SCRIPT = """
+local count = redis.call('INCR', KEYS[1])
+if count == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+end
+return count
+"""
+
 
 class RedisManager:
     """Redis connection manager"""
     
     def __init__(self):
         self.client: Optional[redis.Redis] = None
+        self.rate_limit_script: Optional[AsyncScript] = None
     
     async def connect(self):
         """Initialize Redis connection"""
         settings = get_settings()
         
         try:
-            self.client = redis.from_url(
+            # Bounded pool with keepalive; redis-py picks the hiredis parser when installed
+            pool = redis.ConnectionPool.from_url(
                 settings.redis_url,
+                max_connections=settings.redis_pool_size,
                 encoding="utf-8",
-                decode_responses=True
+                decode_responses=True,
+                socket_keepalive=True,
+                health_check_interval=30
             )
+            self.client = redis.Redis(connection_pool=pool)
             
             # Test connection
             await self.client.ping()
+            
+            # Script SHA is computed once; calls go through EVALSHA
+            self.rate_limit_script = self.client.register_script(RATE_LIMIT_SCRIPT)
             logger.info("Redis connected successfully")
             
         except Exception as e:
@@ -39,7 +58,7 @@ class RedisManager:
     async def disconnect(self):
         """Close Redis connection"""
         if self.client:
-            await self.client.close()
+            await self.client.close(close_connection_pool=True)
             logger.info("Redis disconnected")
     
     def get_client(self) -> redis.Redis:
@@ -47,6 +66,12 @@ class RedisManager:
         if not self.client:
             raise RuntimeError("Redis not connected")
         return self.client
+    
+    async def hit_rate_limit(self, key: str, period: int) -> int:
+        """Increment the rate limit counter for key and return the current count"""
+        if not self.rate_limit_script:
+            raise RuntimeError("Redis not connected")
+        return await self.rate_limit_script(keys=[key], args=[period])
 
 
 # Global Redis manager instance
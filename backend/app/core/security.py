@@ -2,18 +2,22 @@
 Security utilities for authentication and authorization
 """
 
+from dataclasses import dataclass
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Any, Dict, Optional, Union
+import uuid
 
+import jwt
 import structlog
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from google.auth.transport import requests
 from google.oauth2 import id_token
-from jose import JWTError, jwt
 from passlib.context import CryptContext
 
 from app.core.config import get_settings
+from app.core.redis import redis_manager
 
 logger = structlog.get_logger(__name__)
 
@@ -31,6 +35,20 @@ credentials_exception = HTTPException(
 )
 
 
+@dataclass(slots=True, frozen=True)
+class UserClaims:
+    """Authenticated user claims extracted from an access token"""
+    user_id: uuid.UUID
+    email: Optional[str]
+    name: Optional[str]
+
+
+@lru_cache()
+def _get_signing_key() -> bytes:
+    """Get the JWT HMAC key, encoded once per process"""
+    return get_settings().secret_key.encode()
+
+
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token"""
     settings = get_settings()
@@ -45,7 +63,7 @@ def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta]
     
     encoded_jwt = jwt.encode(
         to_encode,
-        settings.secret_key,
+        _get_signing_key(),
         algorithm=settings.algorithm
     )
     
@@ -59,11 +77,11 @@ def verify_token(token: str) -> Dict[str, Any]:
     try:
         payload = jwt.decode(
             token,
-            settings.secret_key,
+            _get_signing_key(),
             algorithms=[settings.algorithm]
         )
         return payload
-    except JWTError as e:
+    except jwt.InvalidTokenError as e:
         logger.warning("JWT verification failed", error=str(e))
         raise credentials_exception
 
@@ -112,25 +130,27 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security)
-) -> Dict[str, Any]:
+) -> UserClaims:
     """Dependency to get current authenticated user from JWT token"""
     token = credentials.credentials
     payload = verify_token(token)
     
-    user_id = payload.get("sub")
-    if user_id is None:
+    # Parsed once here so services and queries take the UUID as-is
+    try:
+        user_id = uuid.UUID(payload.get("sub"))
+    except (TypeError, ValueError):
         raise credentials_exception
     
-    return {
-        "user_id": user_id,
-        "email": payload.get("email"),
-        "name": payload.get("name")
-    }
+    return UserClaims(
+        user_id=user_id,
+        email=payload.get("email"),
+        name=payload.get("name")
+    )
 
 
 async def get_current_active_user(
-    current_user: Dict[str, Any] = Depends(get_current_user)
-) -> Dict[str, Any]:
+    current_user: UserClaims = Depends(get_current_user)
+) -> UserClaims:
     """Dependency to get current active user"""
     # Here you would typically check if the user is active in the database
     # For now, we'll assume all authenticated users are active
@@ -138,13 +158,26 @@ async def get_current_active_user(
 
 
 class RateLimiter:
-    """Rate limiting utility"""
+    """Fixed-window rate limiting dependency backed by Redis"""
     
     def __init__(self, requests: int = 100, period: int = 60):
         self.requests = requests
         self.period = period
     
-    def __call__(self, request):
-        # This would be implemented with Redis in a real application
-        # For now, it's a placeholder
-        return True
\ No newline at end of file
+    async def __call__(self, request: Request) -> None:
+        # request.client is None behind some ASGI servers and in-process test clients
+        client_host = request.client.host if request.client else "unknown"
+        key = f"rl:{request.url.path}:{client_host}"
+        try:
+            count = await redis_manager.hit_rate_limit(key, self.period)
+        except Exception as e:
+            # Fail open: a Redis outage should not take every endpoint down with it
+            logger.warning("Rate limit check failed", key=key, error=str(e))
+            return
+        
+        if count > self.requests:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Rate limit exceeded",
+                headers={"Retry-After": str(self.period)}
+            )
@@ -1,14 +1,42 @@
 # Database models package
+#
+# Models are imported on first attribute access so narrow entrypoints only pay
+# for the tables they use. Call load_all() before anything that needs the full
+# metadata (create_all, migrations, mapper configuration).
+
+import importlib
+
+_MODELS = {
+    "User": "app.models.user",
+    "Agent": "app.models.agent",
+    "Conversation": "app.models.conversation",
+    "Message": "app.models.conversation",
+    "Post": "app.models.post",
+    "Comment": "app.models.post",
+    "PostVote": "app.models.post",
+    "CommentVote": "app.models.post",
+    "Match": "app.models.match",
+    "Notification": "app.models.notification",
+    "Resume": "app.models.resume",
+    "ResumeContent": "app.models.resume",
+    "Embedding": "app.models.embedding",
+    "BackgroundJob": "app.models.background_job",
+}
+
+
+def __getattr__(name):
+    if name not in _MODELS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    model = getattr(importlib.import_module(_MODELS[name]), name)
+    globals()[name] = model
+    return model
+
+
+def load_all() -> None:
+    """Import every model module so all tables are registered on Base.metadata"""
+    for module_name in set(_MODELS.values()):
+        importlib.import_module(module_name)
 
-from .user import User
-from .agent import Agent
-from .conversation import Conversation, Message
-from .post import Post, Comment, PostVote, CommentVote
-from .match import Match
-from .notification import Notification
-from .resume import Resume
-from .embedding import Embedding
-from .background_job import BackgroundJob
 
 __all__ = [
     "User",
@@ -22,6 +50,8 @@ __all__ = [
     "Match",
     "Notification",
     "Resume",
+    "ResumeContent",
     "Embedding",
-    "BackgroundJob"
-]
\ No newline at end of file
+    "BackgroundJob",
+    "load_all"
+]
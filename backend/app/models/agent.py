@@ -4,14 +4,14 @@ Digital Twin Agent model
 
 from datetime import datetime
 from typing import Optional
-import uuid
 
-from sqlalchemy import Column, String, Text, Boolean, DateTime, Integer, JSON, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID, ARRAY
+from sqlalchemy import Column, String, Text, Boolean, DateTime, Integer, ForeignKey, Index, text
+from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
 from app.core.database import Base
+from app.models.types import PortableJSONB, PortableTextArray, UUID_V7_DEFAULT
 
 
 class Agent(Base):
@@ -19,26 +19,30 @@ class Agent(Base):
     
     __tablename__ = "agents"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=UUID_V7_DEFAULT)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     name = Column(String(255), nullable=False)
     personality_type = Column(String(100))  # e.g., "professional", "casual", "technical"
     persona_description = Column(Text)
     conversation_style = Column(
-        JSON,
-        default={"tone": "professional", "enthusiasm_level": 7, "technical_depth": 5}
+        PortableJSONB,
+        default=lambda: {"tone": "professional", "enthusiasm_level": 7, "technical_depth": 5}
     )
     background_context = Column(Text)  # Parsed from resume
-    goals = Column(ARRAY(Text))
-    interests = Column(ARRAY(Text))
+    goals = Column(PortableTextArray)
+    interests = Column(PortableTextArray)
     is_active = Column(Boolean, default=True)
     last_conversation_at = Column(DateTime(timezone=True))
     total_conversations = Column(Integer, default=0)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
+    # Partial index: listing a user's agents only ever reads active rows
+    __table_args__ = (
+        Index("idx_agents_user_active", "user_id", postgresql_where=text("is_active = true")),
+    )
+    
     # Relationships
     user = relationship("User", back_populates="agents")
     
-    def __repr__(self) -> str:
-        return f"<Agent(id={self.id}, name={self.name}, user_id={self.user_id})>"
\ No newline at end of file
+    __repr_attrs__ = ("name", "user_id")
\ No newline at end of file
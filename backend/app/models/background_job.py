@@ -3,14 +3,14 @@ Background Job model for Celery task tracking
 """
 
 from datetime import datetime
-import uuid
 
-from sqlalchemy import Column, String, Text, Integer, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, String, Text, Integer, DateTime, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
 from app.core.database import Base
+from app.models.types import PortableJSONB, UUID_V7_DEFAULT
 
 
 class BackgroundJob(Base):
@@ -18,13 +18,13 @@ class BackgroundJob(Base):
     
     __tablename__ = "background_jobs"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=UUID_V7_DEFAULT)
     task_id = Column(String(255), unique=True, nullable=False)
     task_name = Column(String(255), nullable=False)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"))
     status = Column(String(50), default="pending")  # 'pending', 'running', 'completed', 'failed', 'retrying'
     progress = Column(Integer, default=0)  # 0-100
-    result = Column(JSON)
+    result = Column(PortableJSONB)
     error_message = Column(Text)
     retry_count = Column(Integer, default=0)
     max_retries = Column(Integer, default=3)
@@ -35,5 +35,4 @@ class BackgroundJob(Base):
     # Relationships
     user = relationship("User")
     
-    def __repr__(self) -> str:
-        return f"<BackgroundJob(id={self.id}, task_name={self.task_name}, status={self.status})>"
\ No newline at end of file
+    __repr_attrs__ = ("task_name", "status")
\ No newline at end of file
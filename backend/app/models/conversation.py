@@ -3,14 +3,14 @@ Conversation and Message models
 """
 
 from datetime import datetime
-import uuid
 
-from sqlalchemy import Column, String, Text, Boolean, DateTime, ForeignKey, JSON
-from sqlalchemy.dialects.postgresql import UUID, ARRAY
+from sqlalchemy import Column, String, Text, Boolean, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
 from app.core.database import Base
+from app.models.types import PortableJSONB, PortableTextArray, UUID_V7_DEFAULT
 
 
 class Conversation(Base):
@@ -18,7 +18,7 @@ class Conversation(Base):
     
     __tablename__ = "conversations"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=UUID_V7_DEFAULT)
     type = Column(String(50), nullable=False)  # 'agent_to_agent', 'user_to_user', 'user_to_agent'
     initiator_user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"))
     target_user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"))
@@ -26,15 +26,14 @@ class Conversation(Base):
     target_agent_id = Column(UUID(as_uuid=True), ForeignKey("agents.id", ondelete="SET NULL"))
     status = Column(String(50), default="active")  # 'active', 'ended', 'archived'
     summary = Column(Text)
-    tags = Column(ARRAY(Text))
+    tags = Column(PortableTextArray)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     last_message_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relationships
     messages = relationship("Message", back_populates="conversation", cascade="all, delete-orphan")
     
-    def __repr__(self) -> str:
-        return f"<Conversation(id={self.id}, type={self.type}, status={self.status})>"
+    __repr_attrs__ = ("type", "status")
 
 
 class Message(Base):
@@ -42,7 +41,7 @@ class Message(Base):
     
     __tablename__ = "messages"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=UUID_V7_DEFAULT)
     conversation_id = Column(
         UUID(as_uuid=True), 
         ForeignKey("conversations.id", ondelete="CASCADE"), 
@@ -53,7 +52,7 @@ class Message(Base):
     sender_agent_id = Column(UUID(as_uuid=True), ForeignKey("agents.id", ondelete="SET NULL"))
     content = Column(Text, nullable=False)
     message_type = Column(String(50), default="text")  # 'text', 'system', 'file', 'image'
-    metadata = Column(JSON, default={})  # For file attachments, reactions, etc.
+    meta = Column("metadata", PortableJSONB, default=dict)  # For file attachments, reactions, etc.
     is_edited = Column(Boolean, default=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -61,5 +60,4 @@ class Message(Base):
     # Relationships
     conversation = relationship("Conversation", back_populates="messages")
     
-    def __repr__(self) -> str:
-        return f"<Message(id={self.id}, conversation_id={self.conversation_id}, sender_type={self.sender_type})>"
\ No newline at end of file
+    __repr_attrs__ = ("conversation_id", "sender_type")
\ No newline at end of file
@@ -3,14 +3,14 @@ Embedding model for vector similarity search
 """
 
 from datetime import datetime
-import uuid
 
-from sqlalchemy import Column, String, DateTime, JSON
+from sqlalchemy import Column, String, DateTime, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from pgvector.sqlalchemy import Vector
 
 from app.core.database import Base
+from app.models.types import PortableJSONB, UUID_V7_DEFAULT
 
 
 class Embedding(Base):
@@ -18,12 +18,24 @@ class Embedding(Base):
     
     __tablename__ = "embeddings"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=UUID_V7_DEFAULT)
     entity_type = Column(String(50), nullable=False)  # 'user_profile', 'resume', 'post', 'agent'
     entity_id = Column(UUID(as_uuid=True), nullable=False)
     embedding = Column(Vector(1536))  # OpenAI ada-002 embedding dimension
-    metadata = Column(JSON, default={})
+    meta = Column("metadata", PortableJSONB, default=dict)  # "metadata" is reserved on declarative models
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
-    def __repr__(self) -> str:
-        return f"<Embedding(id={self.id}, entity_type={self.entity_type}, entity_id={self.entity_id})>"
\ No newline at end of file
+    # One embedding per entity (the upsert conflict target); ivfflat index
+    # serves cosine-distance queries (embedding <=> :query) in Postgres
+    __table_args__ = (
+        Index("idx_embeddings_entity", "entity_type", "entity_id", unique=True),
+        Index(
+            "idx_embeddings_vector",
+            "embedding",
+            postgresql_using="ivfflat",
+            postgresql_with={"lists": 100},
+            postgresql_ops={"embedding": "vector_cosine_ops"}
+        ),
+    )
+    
+    __repr_attrs__ = ("entity_type", "entity_id")
\ No newline at end of file
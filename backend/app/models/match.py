@@ -3,7 +3,6 @@ Match model for agent-driven user matching
 """
 
 from datetime import datetime, timedelta
-import uuid
 from decimal import Decimal
 
 from sqlalchemy import Column, String, Text, DateTime, ForeignKey, CheckConstraint, UniqueConstraint, DECIMAL
@@ -12,6 +11,7 @@ from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
 from app.core.database import Base
+from app.models.types import UUID_V7_DEFAULT
 
 
 class Match(Base):
@@ -19,7 +19,7 @@ class Match(Base):
     
     __tablename__ = "matches"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=UUID_V7_DEFAULT)
     user1_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     user2_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     agent1_id = Column(UUID(as_uuid=True), ForeignKey("agents.id", ondelete="CASCADE"), nullable=False)
@@ -59,5 +59,4 @@ class Match(Base):
     agent2 = relationship("Agent", foreign_keys=[agent2_id])
     conversation = relationship("Conversation")
     
-    def __repr__(self) -> str:
-        return f"<Match(id={self.id}, user1_id={self.user1_id}, user2_id={self.user2_id}, status={self.status})>"
\ No newline at end of file
+    __repr_attrs__ = ("user1_id", "user2_id", "status")
\ No newline at end of file
@@ -3,14 +3,14 @@ Notification model
 """
 
 from datetime import datetime
-import uuid
 
-from sqlalchemy import Column, String, Text, Boolean, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, String, Text, Boolean, DateTime, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
 from app.core.database import Base
+from app.models.types import PortableJSONB, UUID_V7_DEFAULT
 
 
 class Notification(Base):
@@ -18,17 +18,16 @@ class Notification(Base):
     
     __tablename__ = "notifications"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=UUID_V7_DEFAULT)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     type = Column(String(100), nullable=False)  # 'match_found', 'message_received', 'post_comment', etc.
     title = Column(String(255), nullable=False)
     content = Column(Text)
-    data = Column(JSON, default={})  # Additional metadata for the notification
+    data = Column(PortableJSONB, default=dict)  # Additional metadata for the notification
     is_read = Column(Boolean, default=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relationships
     user = relationship("User", back_populates="notifications")
     
-    def __repr__(self) -> str:
-        return f"<Notification(id={self.id}, user_id={self.user_id}, type={self.type}, is_read={self.is_read})>"
\ No newline at end of file
+    __repr_attrs__ = ("user_id", "type", "is_read")
\ No newline at end of file
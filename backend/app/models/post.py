@@ -3,14 +3,17 @@ Post, Comment and Vote models for social feed
 """
 
 from datetime import datetime
-import uuid
 
-from sqlalchemy import Column, String, Text, Boolean, DateTime, Integer, ForeignKey, JSON, UniqueConstraint
-from sqlalchemy.dialects.postgresql import UUID, ARRAY
+from sqlalchemy import (
+    Column, String, Text, Boolean, DateTime, Integer, SmallInteger, ForeignKey, Index, Computed,
+    UniqueConstraint, CheckConstraint, text
+)
+from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
 from app.core.database import Base
+from app.models.types import PortableJSONB, PortableTextArray, UUID_V7_DEFAULT
 
 
 class Post(Base):
@@ -18,28 +21,42 @@ class Post(Base):
     
     __tablename__ = "posts"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=UUID_V7_DEFAULT)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     title = Column(String(500), nullable=False)
     content = Column(Text, nullable=False)
     post_type = Column(String(50), default="text")  # 'text', 'link', 'image', 'poll'
-    tags = Column(ARRAY(Text))
-    metadata = Column(JSON, default={})  # For links, images, poll options
+    tags = Column(PortableTextArray)
+    # "metadata" is reserved on declarative models; links, images, poll options
+    meta = Column("metadata", PortableJSONB, nullable=False, server_default=text("'{}'"))
     upvotes = Column(Integer, default=0)
     downvotes = Column(Integer, default=0)
     comment_count = Column(Integer, default=0)
+    score = Column(Integer, Computed("upvotes - downvotes", persisted=True))  # feed ranking
     is_pinned = Column(Boolean, default=False)
     is_archived = Column(Boolean, default=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
+    # GIN index serves tag containment filters (tags @> ARRAY[...]); the score
+    # index lets the ranked feed read its top rows in order instead of sorting
+    __table_args__ = (
+        Index("idx_posts_user_created", "user_id", "created_at"),
+        Index("idx_posts_tags", "tags", postgresql_using="gin"),
+        Index(
+            "idx_posts_score_created",
+            score.desc(),
+            created_at.desc(),
+            postgresql_where=text("NOT is_archived")
+        ),
+    )
+    
     # Relationships
     user = relationship("User", back_populates="posts")
     comments = relationship("Comment", back_populates="post", cascade="all, delete-orphan")
     votes = relationship("PostVote", back_populates="post", cascade="all, delete-orphan")
     
-    def __repr__(self) -> str:
-        return f"<Post(id={self.id}, title={self.title[:50]}, user_id={self.user_id})>"
+    __repr_attrs__ = ("title", "user_id")
 
 
 class PostVote(Base):
@@ -47,21 +64,24 @@ class PostVote(Base):
     
     __tablename__ = "post_votes"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=UUID_V7_DEFAULT)
     post_id = Column(UUID(as_uuid=True), ForeignKey("posts.id", ondelete="CASCADE"), nullable=False)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
-    vote_type = Column(String(10), nullable=False)  # 'up', 'down'
+    vote_type = Column(SmallInteger, nullable=False)  # 1 up, -1 down
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
-    # Unique constraint to prevent duplicate votes
-    __table_args__ = (UniqueConstraint('post_id', 'user_id', name='unique_post_vote'),)
+    # Unique constraint to prevent duplicate votes; the user index covers "my votes" lookups
+    __table_args__ = (
+        UniqueConstraint('post_id', 'user_id', name='unique_post_vote'),
+        CheckConstraint('vote_type IN (-1, 1)', name='check_post_vote_type'),
+        Index("idx_post_votes_user", "user_id", postgresql_include=["post_id", "vote_type"]),
+    )
     
     # Relationships
     post = relationship("Post", back_populates="votes")
     user = relationship("User")
     
-    def __repr__(self) -> str:
-        return f"<PostVote(id={self.id}, post_id={self.post_id}, vote_type={self.vote_type})>"
+    __repr_attrs__ = ("post_id", "vote_type")
 
 
 class Comment(Base):
@@ -69,7 +89,7 @@ class Comment(Base):
     
     __tablename__ = "comments"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=UUID_V7_DEFAULT)
     post_id = Column(UUID(as_uuid=True), ForeignKey("posts.id", ondelete="CASCADE"), nullable=False)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     parent_comment_id = Column(UUID(as_uuid=True), ForeignKey("comments.id", ondelete="SET NULL"))
@@ -87,8 +107,7 @@ class Comment(Base):
     replies = relationship("Comment", back_populates="parent_comment")
     votes = relationship("CommentVote", back_populates="comment", cascade="all, delete-orphan")
     
-    def __repr__(self) -> str:
-        return f"<Comment(id={self.id}, post_id={self.post_id}, user_id={self.user_id})>"
+    __repr_attrs__ = ("post_id", "user_id")
 
 
 class CommentVote(Base):
@@ -96,18 +115,21 @@ class CommentVote(Base):
     
     __tablename__ = "comment_votes"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=UUID_V7_DEFAULT)
     comment_id = Column(UUID(as_uuid=True), ForeignKey("comments.id", ondelete="CASCADE"), nullable=False)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
-    vote_type = Column(String(10), nullable=False)  # 'up', 'down'
+    vote_type = Column(SmallInteger, nullable=False)  # 1 up, -1 down
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
-    # Unique constraint to prevent duplicate votes
-    __table_args__ = (UniqueConstraint('comment_id', 'user_id', name='unique_comment_vote'),)
+    # Unique constraint to prevent duplicate votes; the user index covers "my votes" lookups
+    __table_args__ = (
+        UniqueConstraint('comment_id', 'user_id', name='unique_comment_vote'),
+        CheckConstraint('vote_type IN (-1, 1)', name='check_comment_vote_type'),
+        Index("idx_comment_votes_user", "user_id", postgresql_include=["comment_id", "vote_type"]),
+    )
     
     # Relationships
     comment = relationship("Comment", back_populates="votes")
     user = relationship("User")
     
-    def __repr__(self) -> str:
-        return f"<CommentVote(id={self.id}, comment_id={self.comment_id}, vote_type={self.vote_type})>"
\ No newline at end of file
+    __repr_attrs__ = ("comment_id", "vote_type")
\ No newline at end of file
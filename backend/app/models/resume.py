@@ -1,16 +1,16 @@
 """
-Resume model
+Resume models
 """
 
 from datetime import datetime
-import uuid
 
-from sqlalchemy import Column, String, Text, Boolean, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, String, Text, Boolean, DateTime, ForeignKey, Index, text
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 
 from app.core.database import Base
+from app.models.types import PortableJSONB, UUID_V7_DEFAULT
 
 
 class Resume(Base):
@@ -18,17 +18,46 @@ class Resume(Base):
     
     __tablename__ = "resumes"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=UUID_V7_DEFAULT)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     file_url = Column(String(500), nullable=False)
     file_name = Column(String(255), nullable=False)
-    parsed_data = Column(JSON, nullable=False)  # Structured resume data from parser
-    raw_text = Column(Text)
     is_current = Column(Boolean, default=True)
     uploaded_at = Column(DateTime(timezone=True), server_default=func.now())
     
+    __table_args__ = (
+        Index("idx_resumes_user_current", "user_id", postgresql_where=text("is_current = true")),
+    )
+    
     # Relationships
     user = relationship("User", back_populates="resumes")
+    content = relationship(
+        "ResumeContent", back_populates="resume", uselist=False, cascade="all, delete-orphan"
+    )
+    
+    __repr_attrs__ = ("user_id", "file_name")
+
+
+class ResumeContent(Base):
+    """Parsed resume body, stored apart from the resumes row"""
+    
+    __tablename__ = "resume_contents"
+    
+    resume_id = Column(UUID(as_uuid=True), ForeignKey("resumes.id", ondelete="CASCADE"), primary_key=True)
+    parsed_data = Column(PortableJSONB, nullable=False)  # Structured resume data from parser
+    raw_text = deferred(Column(Text))  # Only needed when re-parsing
+    
+    # jsonb_path_ops GIN index for containment filters such as parsed_data @> '{"skills": ["Python"]}'
+    __table_args__ = (
+        Index(
+            "idx_resume_contents_parsed_data",
+            "parsed_data",
+            postgresql_using="gin",
+            postgresql_ops={"parsed_data": "jsonb_path_ops"}
+        ),
+    )
+    
+    # Relationships
+    resume = relationship("Resume", back_populates="content")
     
-    def __repr__(self) -> str:
-        return f"<Resume(id={self.id}, user_id={self.user_id}, file_name={self.file_name})>"
\ No newline at end of file
+    __repr_attrs__ = ("resume_id",)
@@ -0,0 +1,15 @@
+"""
+Column types and defaults shared by the models
+"""
+
+from sqlalchemy import JSON, Text, text
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+
+# Postgres column types that fall back to JSON on SQLite, so the test suite
+# can create the schema in an in-memory database
+PortableJSONB = JSONB().with_variant(JSON(), "sqlite")
+PortableTextArray = ARRAY(Text).with_variant(JSON(), "sqlite")
+
+# Primary key default; parenthesized because SQLite only takes a function call
+# as a column DEFAULT in that form (Postgres accepts either)
+UUID_V7_DEFAULT = text("(uuid_generate_v7())")
\ No newline at end of file
@@ -4,14 +4,14 @@ User model
 
 from datetime import datetime
 from typing import Optional
-import uuid
 
-from sqlalchemy import Column, String, Text, Boolean, DateTime, JSON
+from sqlalchemy import Column, String, Text, Boolean, DateTime
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
 from app.core.database import Base
+from app.models.types import PortableJSONB, UUID_V7_DEFAULT
 
 
 class User(Base):
@@ -19,7 +19,7 @@ class User(Base):
     
     __tablename__ = "users"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=UUID_V7_DEFAULT)
     email = Column(String(255), unique=True, nullable=False, index=True)
     google_id = Column(String(255), unique=True, nullable=False, index=True)
     full_name = Column(String(255), nullable=False)
@@ -30,8 +30,8 @@ class User(Base):
     github_url = Column(String(500))
     website_url = Column(String(500))
     privacy_settings = Column(
-        JSON,
-        default={"profile_visible": True, "agent_conversations_visible": False}
+        PortableJSONB,
+        default=lambda: {"profile_visible": True, "agent_conversations_visible": False}
     )
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -44,5 +44,4 @@ class User(Base):
     comments = relationship("Comment", back_populates="user", cascade="all, delete-orphan")
     notifications = relationship("Notification", back_populates="user", cascade="all, delete-orphan")
     
-    def __repr__(self) -> str:
-        return f"<User(id={self.id}, email={self.email}, name={self.full_name})>"
\ No newline at end of file
+    __repr_attrs__ = ("email", "full_name")
\ No newline at end of file
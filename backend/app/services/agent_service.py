@@ -2,62 +2,74 @@
 Agent service for managing digital twin agents
 """
 
-from typing import Dict, Any, Optional, List
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
 import uuid
 
 import structlog
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import bindparam, insert, select, update
+from sqlalchemy.orm import raiseload
 from sqlalchemy.exc import IntegrityError
 
 from app.models.agent import Agent
 from app.models.user import User
+from app.core.cache import agent_id_key, get_cached, invalidate_on_commit, set_cached
 from app.core.exceptions import AgentNotFoundError, UserNotFoundError, ValidationError
 
 logger = structlog.get_logger(__name__)
 
 
+def _bulleted_section(heading: str, items: Iterable[str]) -> str:
+    """Render a heading line followed by one "- item" line per entry"""
+    return "".join([f"{heading}:\n", *(f"- {item}\n" for item in items)])
+
+
+# Built once at import; calls only bind parameters
+_GET_AGENT_BY_ID = select(Agent).where(Agent.id == bindparam("agent_id")).options(raiseload("*"))
+_GET_ACTIVE_AGENTS_BY_USER_ID = (
+    select(Agent)
+    .where(Agent.user_id == bindparam("user_id"))
+    .where(Agent.is_active == True)
+    .options(raiseload("*"))
+)
+_USER_EXISTS = select(User.id).where(User.id == bindparam("user_id"))
+
+
 class AgentService:
     """Service for agent-related operations"""
     
     def __init__(self, db: AsyncSession):
         self.db = db
     
-    async def get_agent_by_id(self, agent_id: str) -> Optional[Agent]:
+    async def get_agent_by_id(self, agent_id: uuid.UUID) -> Optional[Agent]:
         """Get agent by ID"""
-        try:
-            agent_uuid = uuid.UUID(agent_id)
-            stmt = select(Agent).where(Agent.id == agent_uuid)
-            result = await self.db.execute(stmt)
-            return result.scalar_one_or_none()
-        except ValueError:
-            raise ValidationError("Invalid agent ID format")
+        cache_key = agent_id_key(agent_id)
+        agent = await get_cached(self.db, Agent, cache_key)
+        if agent:
+            return agent
+        
+        result = await self.db.execute(_GET_AGENT_BY_ID, {"agent_id": agent_id})
+        agent = result.scalar_one_or_none()
+        if agent:
+            await set_cached(agent, cache_key)
+        return agent
     
-    async def get_agents_by_user_id(self, user_id: str) -> List[Agent]:
+    async def get_agents_by_user_id(self, user_id: uuid.UUID) -> List[Agent]:
         """Get all agents for a user"""
-        try:
-            user_uuid = uuid.UUID(user_id)
-            stmt = select(Agent).where(Agent.user_id == user_uuid).where(Agent.is_active == True)
-            result = await self.db.execute(stmt)
-            return result.scalars().all()
-        except ValueError:
-            raise ValidationError("Invalid user ID format")
+        result = await self.db.execute(_GET_ACTIVE_AGENTS_BY_USER_ID, {"user_id": user_id})
+        return result.scalars().all()
     
-    async def create_agent(self, user_id: str, agent_data: Dict[str, Any]) -> Agent:
+    async def create_agent(self, user_id: uuid.UUID, agent_data: Dict[str, Any]) -> Agent:
         """Create a new agent for a user"""
         try:
-            user_uuid = uuid.UUID(user_id)
-            
             # Verify user exists
-            user_stmt = select(User).where(User.id == user_uuid)
-            user_result = await self.db.execute(user_stmt)
-            user = user_result.scalar_one_or_none()
-            
-            if not user:
+            user_result = await self.db.execute(_USER_EXISTS, {"user_id": user_id})
+            if user_result.scalar_one_or_none() is None:
                 raise UserNotFoundError(user_id)
             
-            agent = Agent(
-                user_id=user_uuid,
+            stmt = insert(Agent).values(
+                user_id=user_id,
                 name=agent_data["name"],
                 personality_type=agent_data.get("personality_type", "professional"),
                 persona_description=agent_data.get("persona_description"),
@@ -69,92 +81,96 @@ class AgentService:
                 background_context=agent_data.get("background_context"),
                 goals=agent_data.get("goals", []),
                 interests=agent_data.get("interests", [])
-            )
+            ).returning(Agent)
             
-            self.db.add(agent)
-            await self.db.commit()
-            await self.db.refresh(agent)
+            agent = (await self.db.execute(stmt)).scalar_one()
             
-            logger.info("Agent created successfully", agent_id=str(agent.id), user_id=user_id)
+            logger.info("Agent created successfully", agent_id=str(agent.id), user_id=str(user_id))
             return agent
             
-        except ValueError:
-            raise ValidationError("Invalid user ID format")
         except IntegrityError as e:
             await self.db.rollback()
             logger.error("Failed to create agent", error=str(e))
             raise ValidationError("Failed to create agent")
     
-    async def update_agent(self, agent_id: str, user_id: str, agent_data: Dict[str, Any]) -> Agent:
+    async def update_agent(self, agent_id: uuid.UUID, user_id: uuid.UUID, agent_data: Dict[str, Any]) -> Agent:
         """Update agent information"""
-        agent = await self.get_agent_by_id(agent_id)
-        if not agent:
-            raise AgentNotFoundError(agent_id)
-        
-        # Verify ownership
-        if str(agent.user_id) != user_id:
-            raise ValidationError("You don't have permission to update this agent")
-        
         # Update allowed fields
         allowed_fields = [
             "name", "personality_type", "persona_description", 
             "conversation_style", "background_context", "goals", "interests"
         ]
+        changes = {field: agent_data[field] for field in allowed_fields if field in agent_data}
+        
+        agent = None
+        if changes:
+            # Ownership is part of the WHERE clause; a miss is resolved below
+            stmt = (
+                update(Agent)
+                .where(Agent.id == agent_id, Agent.user_id == user_id)
+                .values(**changes)
+                .returning(Agent)
+                .execution_options(populate_existing=True)
+            )
+            try:
+                agent = (await self.db.execute(stmt)).scalar_one_or_none()
+            except IntegrityError as e:
+                await self.db.rollback()
+                logger.error("Failed to update agent", error=str(e))
+                raise ValidationError("Failed to update agent")
         
-        for field in allowed_fields:
-            if field in agent_data:
-                setattr(agent, field, agent_data[field])
-        
-        try:
-            await self.db.commit()
-            await self.db.refresh(agent)
+        if not agent:
+            agent = await self.get_agent_by_id(agent_id)
+            if not agent:
+                raise AgentNotFoundError(agent_id)
             
-            logger.info("Agent updated successfully", agent_id=agent_id)
-            return agent
+            # Verify ownership
+            if agent.user_id != user_id:
+                raise ValidationError("You don't have permission to update this agent")
             
-        except IntegrityError as e:
-            await self.db.rollback()
-            logger.error("Failed to update agent", error=str(e))
-            raise ValidationError("Failed to update agent")
+            return agent
+        
+        invalidate_on_commit(self.db, agent_id_key(agent.id))
+        
+        logger.info("Agent updated successfully", agent_id=str(agent_id))
+        return agent
     
-    async def delete_agent(self, agent_id: str, user_id: str) -> bool:
+    async def delete_agent(self, agent_id: uuid.UUID, user_id: uuid.UUID) -> bool:
         """Delete (deactivate) an agent"""
         agent = await self.get_agent_by_id(agent_id)
         if not agent:
             raise AgentNotFoundError(agent_id)
         
         # Verify ownership
-        if str(agent.user_id) != user_id:
+        if agent.user_id != user_id:
             raise ValidationError("You don't have permission to delete this agent")
         
         agent.is_active = False
-        await self.db.commit()
+        await self.db.flush()
+        invalidate_on_commit(self.db, agent_id_key(agent.id))
         
-        logger.info("Agent deactivated", agent_id=agent_id, user_id=user_id)
+        logger.info("Agent deactivated", agent_id=str(agent_id), user_id=str(user_id))
         return True
     
-    async def activate_agent(self, agent_id: str, user_id: str) -> bool:
+    async def activate_agent(self, agent_id: uuid.UUID, user_id: uuid.UUID) -> bool:
         """Activate an agent"""
         agent = await self.get_agent_by_id(agent_id)
         if not agent:
             raise AgentNotFoundError(agent_id)
         
         # Verify ownership
-        if str(agent.user_id) != user_id:
+        if agent.user_id != user_id:
             raise ValidationError("You don't have permission to activate this agent")
         
         agent.is_active = True
-        await self.db.commit()
+        await self.db.flush()
+        invalidate_on_commit(self.db, agent_id_key(agent.id))
         
-        logger.info("Agent activated", agent_id=agent_id, user_id=user_id)
+        logger.info("Agent activated", agent_id=str(agent_id), user_id=str(user_id))
         return True
     
-    async def update_agent_context_from_resume(self, agent_id: str, resume_data: Dict[str, Any]) -> Agent:
+    async def update_agent_context_from_resume(self, agent_id: uuid.UUID, resume_data: Dict[str, Any]) -> Agent:
         """Update agent's background context from parsed resume data"""
-        agent = await self.get_agent_by_id(agent_id)
-        if not agent:
-            raise AgentNotFoundError(agent_id)
-        
         # Build background context from resume
         context_parts = []
         
@@ -168,49 +184,61 @@ class AgentService:
             context_parts.append(f"Name: {personal_info['name']}")
         
         if experience:
-            exp_summary = "Professional Experience:\n"
-            for exp in experience[:3]:  # Top 3 experiences
-                title = exp.get("title", "Unknown role")
-                exp_summary += f"- {title}\n"
-            context_parts.append(exp_summary)
+            context_parts.append(_bulleted_section(
+                "Professional Experience",
+                (exp.get("title", "Unknown role") for exp in experience[:3])  # Top 3 experiences
+            ))
         
         if education:
-            edu_summary = "Education:\n"
-            for edu in education:
-                institution = edu.get("institution", "Educational institution")
-                edu_summary += f"- {institution}\n"
-            context_parts.append(edu_summary)
+            context_parts.append(_bulleted_section(
+                "Education",
+                (edu.get("institution", "Educational institution") for edu in education)
+            ))
         
         if skills:
             skills_summary = f"Skills: {', '.join(skills[:10])}"  # Top 10 skills
             context_parts.append(skills_summary)
         
         if projects:
-            proj_summary = "Projects:\n"
-            for proj in projects[:3]:  # Top 3 projects
-                name = proj.get("name", "Project")
-                proj_summary += f"- {name}\n"
-            context_parts.append(proj_summary)
+            context_parts.append(_bulleted_section(
+                "Projects",
+                (proj.get("name", "Project") for proj in projects[:3])  # Top 3 projects
+            ))
         
         background_context = "\n\n".join(context_parts)
         
         # Update agent
-        agent.background_context = background_context
-        await self.db.commit()
-        await self.db.refresh(agent)
+        stmt = (
+            update(Agent)
+            .where(Agent.id == agent_id)
+            .values(background_context=background_context)
+            .returning(Agent)
+            .execution_options(populate_existing=True)
+        )
+        agent = (await self.db.execute(stmt)).scalar_one_or_none()
+        if not agent:
+            raise AgentNotFoundError(agent_id)
         
-        logger.info("Agent context updated from resume", agent_id=agent_id)
+        invalidate_on_commit(self.db, agent_id_key(agent_id))
+        
+        logger.info("Agent context updated from resume", agent_id=str(agent_id))
         return agent
     
-    async def increment_conversation_count(self, agent_id: str) -> None:
-        """Increment the conversation count for an agent"""
-        agent = await self.get_agent_by_id(agent_id)
-        if not agent:
+    async def increment_conversation_count(self, agent_id: uuid.UUID) -> None:
+        """Record a conversation for an agent"""
+        stmt = (
+            update(Agent)
+            .where(Agent.id == agent_id)
+            .values(
+                total_conversations=Agent.total_conversations + 1,
+                last_conversation_at=datetime.now(timezone.utc)
+            )
+            .returning(Agent.id)
+        )
+        if (await self.db.execute(stmt)).scalar_one_or_none() is None:
             raise AgentNotFoundError(agent_id)
         
-        agent.total_conversations += 1
-        from datetime import datetime
-        agent.last_conversation_at = datetime.utcnow()
-        await self.db.commit()
+        # The agents invalidation trigger ignores counter columns; drop the cached row here
+        invalidate_on_commit(self.db, agent_id_key(agent_id))
         
-        logger.debug("Agent conversation count incremented", agent_id=agent_id)
\ No newline at end of file
+        logger.debug("Agent conversation count incremented", agent_id=str(agent_id))
\ No newline at end of file
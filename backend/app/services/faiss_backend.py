@@ -0,0 +1,152 @@
+"""
+In-process FAISS vector index with the subset of the Pinecone Index API used by VectorService
+"""
+
+from typing import Any, Dict, List, NamedTuple, Optional
+import threading
+
+import numpy as np
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+
+class FaissMatch(NamedTuple):
+    id: str
+    score: float
+    metadata: Dict[str, Any]
+
+
+class FaissQueryResponse(NamedTuple):
+    matches: List[FaissMatch]
+
+
+class FaissVector(NamedTuple):
+    id: str
+    values: List[float]
+
+
+class FaissFetchResponse(NamedTuple):
+    vectors: Dict[str, FaissVector]
+
+
+class FaissIndexStats(NamedTuple):
+    total_vector_count: int
+    dimension: int
+    index_fullness: float
+    namespaces: Dict[str, Any]
+
+
+def _unit_rows(vectors: np.ndarray) -> np.ndarray:
+    """Scale each row to unit length in place; all-zero rows are left as is"""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return np.divide(vectors, norms, out=vectors, where=norms > 0)
+
+
+class FaissVectorBackend:
+    """
+    Exact cosine-similarity search over vectors held in process memory
+    
+    Vectors are normalized on the way in, so inner product equals cosine
+    similarity and scores line up with the Pinecone cosine index. Nothing is
+    persisted and each process has its own index: meant for local development
+    and tests.
+    """
+    
+    def __init__(self, dimension: int):
+        import faiss  # optional dependency, only needed for this backend
+        
+        self.dimension = dimension
+        self._index = faiss.IndexIDMap2(faiss.IndexFlatIP(dimension))
+        self._lock = threading.Lock()
+        self._int_ids: Dict[str, int] = {}
+        self._str_ids: Dict[int, str] = {}
+        self._metadata: Dict[str, Dict[str, Any]] = {}
+        self._next_id = 0
+        logger.info("FAISS vector backend initialized", dimension=dimension)
+    
+    def upsert(self, vectors: List[Dict[str, Any]]) -> None:
+        """Insert or replace vectors given as {"id", "values", "metadata"} dicts"""
+        # A repeated ID in one batch would be added twice; the last one wins, as in Pinecone
+        vectors = list({vector["id"]: vector for vector in vectors}.values())
+        with self._lock:
+            replaced = [self._int_ids[vector["id"]] for vector in vectors if vector["id"] in self._int_ids]
+            if replaced:
+                self._index.remove_ids(np.asarray(replaced, dtype=np.int64))
+            
+            int_ids = []
+            for vector in vectors:
+                int_id = self._int_ids.get(vector["id"])
+                if int_id is None:
+                    int_id = self._int_ids[vector["id"]] = self._next_id
+                    self._str_ids[int_id] = vector["id"]
+                    self._next_id += 1
+                int_ids.append(int_id)
+                self._metadata[vector["id"]] = vector.get("metadata") or {}
+            
+            values = _unit_rows(np.array([vector["values"] for vector in vectors], dtype=np.float32))
+            self._index.add_with_ids(values, np.asarray(int_ids, dtype=np.int64))
+    
+    def query(
+        self,
+        vector: Optional[List[float]] = None,
+        id: Optional[str] = None,
+        top_k: int = 10,
+        include_metadata: bool = True,
+        filter: Optional[Dict[str, Any]] = None
+    ) -> FaissQueryResponse:
+        """Nearest neighbours of a vector, or of a stored vector by ID"""
+        with self._lock:
+            if id is not None:
+                if id not in self._int_ids:
+                    return FaissQueryResponse(matches=[])
+                query = self._index.reconstruct(self._int_ids[id]).reshape(1, -1)
+            else:
+                query = _unit_rows(np.array(vector, dtype=np.float32).reshape(1, -1))
+            
+            # FAISS can't filter on metadata; scan everything and filter below
+            k = self._index.ntotal if filter else min(top_k, self._index.ntotal)
+            if k == 0:
+                return FaissQueryResponse(matches=[])
+            scores, int_ids = self._index.search(query, k)
+            
+            matches = []
+            for score, int_id in zip(scores[0], int_ids[0]):
+                if int_id < 0:
+                    continue
+                vector_id = self._str_ids[int(int_id)]
+                metadata = self._metadata[vector_id]
+                if filter and any(metadata.get(key) != value for key, value in filter.items()):
+                    continue
+                matches.append(FaissMatch(id=vector_id, score=float(score), metadata=metadata if include_metadata else {}))
+                if len(matches) == top_k:
+                    break
+            return FaissQueryResponse(matches=matches)
+    
+    def fetch(self, ids: List[str]) -> FaissFetchResponse:
+        """Stored vectors for the IDs that exist"""
+        with self._lock:
+            return FaissFetchResponse(vectors={
+                vector_id: FaissVector(id=vector_id, values=self._index.reconstruct(self._int_ids[vector_id]).tolist())
+                for vector_id in ids
+                if vector_id in self._int_ids
+            })
+    
+    def delete(self, ids: List[str]) -> None:
+        """Remove vectors by ID; unknown IDs are ignored"""
+        with self._lock:
+            int_ids = [self._int_ids.pop(vector_id) for vector_id in ids if vector_id in self._int_ids]
+            for int_id in int_ids:
+                self._metadata.pop(self._str_ids.pop(int_id), None)
+            if int_ids:
+                self._index.remove_ids(np.asarray(int_ids, dtype=np.int64))
+    
+    def describe_index_stats(self) -> FaissIndexStats:
+        """Index statistics in the shape of Pinecone's describe_index_stats"""
+        with self._lock:
+            return FaissIndexStats(
+                total_vector_count=self._index.ntotal,
+                dimension=self.dimension,
+                index_fullness=0.0,
+                namespaces={}
+            )
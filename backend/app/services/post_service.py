@@ -0,0 +1,109 @@
+"""
+Post service for social feed operations
+"""
+
+from datetime import datetime
+from functools import lru_cache
+from typing import List, Optional, Tuple
+import base64
+import json
+import uuid
+
+import structlog
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Select, bindparam, select, tuple_
+from sqlalchemy.orm import joinedload, raiseload, selectinload
+
+from app.models.post import Post, Comment
+from app.core.exceptions import ValidationError
+
+logger = structlog.get_logger(__name__)
+
+# Relationship loading strategy for feed reads (anything not listed raises on
+# access instead of silently lazy-loading):
+# - Post.user / Comment.user: many-to-one. selectinload for lists (one IN query
+#   for all authors), joinedload for single rows (no extra round-trip).
+# - Post.comments: one-to-many collection, selectinload so the parent row is not
+#   multiplied by a JOIN. Only the detail view serializes comments.
+# Built on first use: loader options configure the mappers, which needs every
+# model registered (database_manager.connect loads them), not just app.models.post.
+@lru_cache()
+def _feed_load_options() -> Tuple:
+    return (selectinload(Post.user), raiseload("*"))
+
+
+@lru_cache()
+def _get_post_by_id_query() -> Select:
+    return select(Post).where(Post.id == bindparam("post_id")).options(
+        joinedload(Post.user),
+        selectinload(Post.comments).selectinload(Comment.user),
+        raiseload("*"),
+    )
+
+
+def _encode_cursor(post: Post) -> str:
+    """Encode a post's (created_at, id) sort key as an opaque cursor"""
+    payload = json.dumps([post.created_at.isoformat(), str(post.id)])
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    """Decode a cursor produced by _encode_cursor"""
+    try:
+        created_at, post_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(created_at), uuid.UUID(post_id)
+    except (ValueError, TypeError):
+        raise ValidationError("Invalid cursor")
+
+
+class PostService:
+    """Service for post-related operations"""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def get_post_by_id(self, post_id: uuid.UUID) -> Optional[Post]:
+        """Get post by ID with author and comments loaded"""
+        result = await self.db.execute(_get_post_by_id_query(), {"post_id": post_id})
+        return result.scalar_one_or_none()
+    
+    async def list_posts(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 20,
+        tags: Optional[List[str]] = None
+    ) -> Tuple[List[Post], Optional[str]]:
+        """Get a page of non-archived posts, newest first, and the cursor for the next page"""
+        stmt = self._feed_query(tags).order_by(Post.created_at.desc(), Post.id.desc())
+        
+        if cursor:
+            created_at, post_id = _decode_cursor(cursor)
+            stmt = stmt.where(tuple_(Post.created_at, Post.id) < tuple_(created_at, post_id))
+        
+        # Fetch one extra row to learn whether another page exists
+        result = await self.db.execute(stmt.limit(limit + 1))
+        posts = result.scalars().all()
+        
+        next_cursor = None
+        if len(posts) > limit:
+            posts = posts[:limit]
+            next_cursor = _encode_cursor(posts[-1])
+        return posts, next_cursor
+    
+    async def get_feed_posts(
+        self,
+        skip: int = 0,
+        limit: int = 20,
+        tags: Optional[List[str]] = None
+    ) -> List[Post]:
+        """Get non-archived posts ranked by score"""
+        stmt = self._feed_query(tags).order_by(Post.score.desc(), Post.created_at.desc())
+        result = await self.db.execute(stmt.offset(skip).limit(limit))
+        return result.scalars().all()
+    
+    def _feed_query(self, tags: Optional[List[str]]) -> Select:
+        """Base feed query with authors loaded"""
+        stmt = select(Post).where(Post.is_archived == False).options(*_feed_load_options())
+        if tags:
+            stmt = stmt.where(Post.tags.contains(tags))
+        return stmt
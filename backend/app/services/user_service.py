@@ -7,47 +7,71 @@ import uuid
 
 import structlog
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import raiseload
 from sqlalchemy.exc import IntegrityError
 
 from app.models.user import User
+from app.core.cache import get_cached, invalidate_on_commit, set_cached, user_google_key, user_id_key
 from app.core.exceptions import UserNotFoundError, ValidationError
 
 logger = structlog.get_logger(__name__)
 
 
+_GET_USER_BY_ID = select(User).where(User.id == bindparam("user_id")).options(raiseload("*"))
+_GET_USER_BY_EMAIL = select(User).where(User.email == bindparam("email")).options(raiseload("*"))
+_GET_USER_BY_GOOGLE_ID = select(User).where(User.google_id == bindparam("google_id")).options(raiseload("*"))
+
+
 class UserService:
     """Service for user-related operations"""
     
     def __init__(self, db: AsyncSession):
         self.db = db
     
-    async def get_user_by_id(self, user_id: str) -> Optional[User]:
+    async def get_user_by_id(self, user_id: uuid.UUID) -> Optional[User]:
         """Get user by ID"""
-        try:
-            user_uuid = uuid.UUID(user_id)
-            stmt = select(User).where(User.id == user_uuid)
-            result = await self.db.execute(stmt)
-            return result.scalar_one_or_none()
-        except ValueError:
-            raise ValidationError("Invalid user ID format")
+        user = await get_cached(self.db, User, user_id_key(user_id))
+        if user:
+            return user
+        
+        result = await self.db.execute(_GET_USER_BY_ID, {"user_id": user_id})
+        user = result.scalar_one_or_none()
+        if user:
+            await self._cache_user(user)
+        return user
     
     async def get_user_by_email(self, email: str) -> Optional[User]:
         """Get user by email"""
-        stmt = select(User).where(User.email == email)
-        result = await self.db.execute(stmt)
+        result = await self.db.execute(_GET_USER_BY_EMAIL, {"email": email})
         return result.scalar_one_or_none()
     
     async def get_user_by_google_id(self, google_id: str) -> Optional[User]:
         """Get user by Google ID"""
-        stmt = select(User).where(User.google_id == google_id)
-        result = await self.db.execute(stmt)
-        return result.scalar_one_or_none()
+        user = await get_cached(self.db, User, user_google_key(google_id))
+        if user:
+            return user
+        
+        result = await self.db.execute(_GET_USER_BY_GOOGLE_ID, {"google_id": google_id})
+        user = result.scalar_one_or_none()
+        if user:
+            await self._cache_user(user)
+        return user
+    
+    async def _cache_user(self, user: User) -> None:
+        """Cache user under both its ID and Google ID keys"""
+        await set_cached(user, user_id_key(user.id), user_google_key(user.google_id))
+    
+    def _invalidate_user(self, user: User) -> None:
+        """Drop cached copies of user once the write commits"""
+        invalidate_on_commit(self.db, user_id_key(user.id), user_google_key(user.google_id))
     
     async def create_user(self, user_data: Dict[str, Any]) -> User:
         """Create a new user"""
-        try:
-            user = User(
+        stmt = (
+            insert(User)
+            .values(
                 email=user_data["email"],
                 google_id=user_data["google_id"],
                 full_name=user_data["full_name"],
@@ -62,10 +86,11 @@ class UserService:
                     "agent_conversations_visible": False
                 })
             )
-            
-            self.db.add(user)
-            await self.db.commit()
-            await self.db.refresh(user)
+            .returning(User)
+        )
+        
+        try:
+            user = (await self.db.execute(stmt)).scalar_one()
             
             logger.info("User created successfully", user_id=str(user.id), email=user.email)
             return user
@@ -75,25 +100,35 @@ class UserService:
             logger.error("Failed to create user", error=str(e))
             raise ValidationError("User with this email or Google ID already exists")
     
-    async def update_user(self, user_id: str, user_data: Dict[str, Any]) -> User:
+    async def update_user(self, user_id: uuid.UUID, user_data: Dict[str, Any]) -> User:
         """Update user information"""
-        user = await self.get_user_by_id(user_id)
-        if not user:
-            raise UserNotFoundError(user_id)
-        
         # Update allowed fields
         allowed_fields = [
             "full_name", "bio", "location", "linkedin_url", 
             "github_url", "website_url", "privacy_settings"
         ]
+        changes = {field: user_data[field] for field in allowed_fields if field in user_data}
+        
+        if not changes:
+            user = await self.get_user_by_id(user_id)
+            if not user:
+                raise UserNotFoundError(user_id)
+            return user
         
-        for field in allowed_fields:
-            if field in user_data:
-                setattr(user, field, user_data[field])
+        stmt = (
+            update(User)
+            .where(User.id == user_id)
+            .values(**changes)
+            .returning(User)
+            .execution_options(populate_existing=True)
+        )
         
         try:
-            await self.db.commit()
-            await self.db.refresh(user)
+            user = (await self.db.execute(stmt)).scalar_one_or_none()
+            if not user:
+                raise UserNotFoundError(user_id)
+            
+            self._invalidate_user(user)
             
             logger.info("User updated successfully", user_id=str(user.id))
             return user
@@ -105,61 +140,59 @@ class UserService:
     
     async def get_or_create_user_from_google(self, google_user_info: Dict[str, Any]) -> User:
         """Get existing user or create new user from Google OAuth info"""
-        # First try to find by Google ID
-        user = await self.get_user_by_google_id(google_user_info["google_id"])
-        
-        if user:
-            # Update user info if needed
-            update_data = {}
-            if user.full_name != google_user_info["name"]:
-                update_data["full_name"] = google_user_info["name"]
-            if user.profile_picture_url != google_user_info.get("picture"):
-                update_data["profile_picture_url"] = google_user_info.get("picture")
-            
-            if update_data:
-                user = await self.update_user(str(user.id), update_data)
-            
-            return user
-        
-        # Try to find by email
-        user = await self.get_user_by_email(google_user_info["email"])
-        if user:
-            # Update Google ID for existing user
-            user.google_id = google_user_info["google_id"]
-            await self.db.commit()
-            await self.db.refresh(user)
-            return user
-        
-        # Create new user
-        user_data = {
-            "email": google_user_info["email"],
-            "google_id": google_user_info["google_id"],
+        profile = {
             "full_name": google_user_info["name"],
-            "profile_picture_url": google_user_info.get("picture")
+            "profile_picture_url": google_user_info.get("picture"),
         }
         
-        return await self.create_user(user_data)
+        # Insert or refresh the profile keyed on Google ID in one round-trip
+        stmt = (
+            insert(User)
+            .values(email=google_user_info["email"], google_id=google_user_info["google_id"], **profile)
+            .on_conflict_do_update(index_elements=[User.google_id], set_=profile)
+            .returning(User)
+            .execution_options(populate_existing=True)
+        )
+        
+        try:
+            async with self.db.begin_nested():
+                user = (await self.db.execute(stmt)).scalar_one()
+        except IntegrityError:
+            # New Google ID for an email that is already registered: link it
+            stmt = (
+                update(User)
+                .where(User.email == google_user_info["email"])
+                .values(google_id=google_user_info["google_id"], **profile)
+                .returning(User)
+                .execution_options(populate_existing=True)
+            )
+            user = (await self.db.execute(stmt)).scalar_one()
+        
+        self._invalidate_user(user)
+        return user
     
-    async def deactivate_user(self, user_id: str) -> bool:
+    async def deactivate_user(self, user_id: uuid.UUID) -> bool:
         """Deactivate user account"""
         user = await self.get_user_by_id(user_id)
         if not user:
             raise UserNotFoundError(user_id)
         
         user.is_active = False
-        await self.db.commit()
+        await self.db.flush()
+        self._invalidate_user(user)
         
-        logger.info("User deactivated", user_id=user_id)
+        logger.info("User deactivated", user_id=str(user_id))
         return True
     
-    async def activate_user(self, user_id: str) -> bool:
+    async def activate_user(self, user_id: uuid.UUID) -> bool:
         """Activate user account"""
         user = await self.get_user_by_id(user_id)
         if not user:
             raise UserNotFoundError(user_id)
         
         user.is_active = True
-        await self.db.commit()
+        await self.db.flush()
+        self._invalidate_user(user)
         
-        logger.info("User activated", user_id=user_id)
+        logger.info("User activated", user_id=str(user_id))
         return True
\ No newline at end of file
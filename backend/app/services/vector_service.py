@@ -2,164 +2,459 @@
 Vector store service for embeddings and similarity search using Pinecone
 """
 
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar, Union
+import asyncio
+import base64
+import functools
+import hashlib
+import random
+import threading
 import uuid
+import weakref
 import numpy as np
 
 import structlog
+import httpx
 import openai
-import pinecone
+from pinecone import Index, Pinecone, PodSpec
+from pinecone.grpc import GRPCClientConfig, GRPCIndex, PineconeGRPC
+import redis.asyncio as redis
+from celery.signals import worker_process_init
+from sqlalchemy import delete
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.config import get_settings
+from app.core.cache import embedding_source_key, embedding_version_key
+from app.core.config import Settings, get_settings
 from app.models.embedding import Embedding
+from app.services.faiss_backend import FaissVectorBackend
 from app.core.exceptions import ExternalServiceError
 
 logger = structlog.get_logger(__name__)
 
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Pinecone recommends at most 100 vectors per upsert and 1000 IDs per fetch or delete
+_PINECONE_UPSERT_BATCH_SIZE = 100
+_PINECONE_FETCH_BATCH_SIZE = 1000
+_PINECONE_DELETE_BATCH_SIZE = 1000
+
+# Keep the worker's one HTTP/2 channel to Pinecone open between tasks, so
+# a task arriving after an idle spell skips the TCP and TLS handshakes
+_GRPC_KEEPALIVE_OPTIONS = {
+    "grpc.keepalive_time_ms": 30_000,
+    "grpc.keepalive_timeout_ms": 10_000,
+    "grpc.keepalive_permit_without_calls": 1,
+    "grpc.http2.max_pings_without_data": 0,
+}
+
+# Upper bound of the random delay before each request of a multi-request
+# batch, so it does not hit the API as one burst and trip rate limits
+_REQUEST_JITTER = 0.05  # seconds
+
+_EMBEDDING_DIMENSION = 1536  # OpenAI ada-002 embedding dimension
+
+# Initial rows of the per-service buffer batched similarity math stacks vectors into
+_SCRATCH_ROWS = 1024
+
+# Interest search fetches this many times top_k dense candidates, then moves
+# each candidate's score toward 1 by this weight times the share of queried
+# interests it lists verbatim
+_INTEREST_OVERSAMPLE = 3
+_INTEREST_OVERLAP_WEIGHT = 0.5
+
+
+def _vector_id(entity_type: str, entity_id: Union[uuid.UUID, str]) -> str:
+    return f"{entity_type}_{entity_id}"
+
+
+# Clients are shared by every VectorService. The vector index (Pinecone, or
+# FAISS in-process) is created once per process and called from worker threads; the async OpenAI client's
+# connections belong to an event loop, so there is one per loop (Celery tasks
+# each run their own)
+_clients_lock = threading.Lock()
+_vector_index: Optional[Union[Index, GRPCIndex, FaissVectorBackend]] = None
+_openai_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, openai.AsyncOpenAI]" = weakref.WeakKeyDictionary()
+_vector_service: Optional["VectorService"] = None
+
+
+@worker_process_init.connect
+def _reset_clients(**kwargs) -> None:
+    """
+    Drop clients inherited from the Celery parent after a prefork
+    
+    Their sockets (and a gRPC channel's threads) are shared with the parent
+    and break once both processes use them; the child rebuilds its own on
+    first use. The lock is replaced too, in case it was held mid-fork.
+    """
+    global _clients_lock, _vector_index, _vector_service
+    _clients_lock = threading.Lock()
+    _vector_index = None
+    _vector_service = None
+    _openai_clients.clear()
+
+
+def _shared_openai_client(settings: Settings) -> openai.AsyncOpenAI:
+    """Return the OpenAI client for the running event loop, creating it on first use"""
+    loop = asyncio.get_running_loop()
+    client = _openai_clients.get(loop)
+    if client is None:
+        client = openai.AsyncOpenAI(
+            api_key=settings.openai_api_key,
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+            )
+        )
+        _openai_clients[loop] = client
+    return client
+
+
+def _shared_vector_index(settings: Settings) -> Union[Index, GRPCIndex, FaissVectorBackend]:
+    """Return the process-wide vector index for settings.vector_backend, creating it on first use"""
+    global _vector_index
+    with _clients_lock:
+        if _vector_index is None and settings.vector_backend == "faiss":
+            _vector_index = FaissVectorBackend(_EMBEDDING_DIMENSION)
+        
+        if _vector_index is None:
+            # gRPC multiplexes requests over one HTTP/2 channel with protobuf payloads
+            grpc = settings.pinecone_transport == "grpc"
+            client = (PineconeGRPC if grpc else Pinecone)(api_key=settings.pinecone_api_key)
+            
+            # Get or create index
+            if settings.pinecone_index_name not in client.list_indexes().names():
+                client.create_index(
+                    name=settings.pinecone_index_name,
+                    dimension=_EMBEDDING_DIMENSION,
+                    metric="cosine",
+                    spec=PodSpec(environment=settings.pinecone_environment)
+                )
+            
+            if grpc:
+                _vector_index = client.Index(
+                    settings.pinecone_index_name,
+                    grpc_config=GRPCClientConfig(
+                        reuse_channel=True,
+                        grpc_channel_options=_GRPC_KEEPALIVE_OPTIONS
+                    )
+                )
+            else:
+                _vector_index = client.Index(settings.pinecone_index_name)
+            logger.info("Vector service clients initialized successfully")
+        
+        return _vector_index
+
+
+def _l2_normalized(vectors: np.ndarray) -> np.ndarray:
+    """Scale each row of vectors to unit length in place; all-zero rows are left as is"""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return np.divide(vectors, norms, out=vectors, where=norms > 0)
+
+
+def _interest_terms(interests: Sequence[str]) -> List[str]:
+    """Canonical interest keywords: lowercased, whitespace collapsed, deduplicated"""
+    return sorted({" ".join(interest.lower().split()) for interest in interests} - {""})
+
+
+def _indexed_metadata(metadata: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Entity metadata as stored in the vector index, with interests in canonical form"""
+    metadata = dict(metadata or {})
+    if metadata.get("interests"):
+        metadata["interests"] = _interest_terms(metadata["interests"])
+    return metadata
+
+
+def _embedding_cache_key(model: str, text: str) -> str:
+    """Cache key for a text's embedding; runs of whitespace don't change the key"""
+    normalized = " ".join(text.split())
+    digest = hashlib.sha256(f"{model}\0{normalized}".encode()).hexdigest()
+    return f"embedding:{digest}"
+
 
 class VectorService:
     """Service for vector operations and similarity search"""
     
     def __init__(self):
         self.settings = get_settings()
-        self.openai_client = None
-        self.pinecone_index = None
+        self.vector_index: Optional[Union[Index, GRPCIndex, FaissVectorBackend]] = None
+        self.redis_client = None
+        self._scratch: Optional[np.ndarray] = None
         self._initialize_clients()
     
     def _initialize_clients(self):
-        """Initialize OpenAI and Pinecone clients"""
+        """Attach the shared vector index and open the embedding cache"""
         try:
-            # Initialize OpenAI client
-            self.openai_client = openai.OpenAI(api_key=self.settings.openai_api_key)
-            
-            # Initialize Pinecone
-            pinecone.init(
-                api_key=self.settings.pinecone_api_key,
-                environment=self.settings.pinecone_environment
-            )
-            
-            # Get or create index
-            if self.settings.pinecone_index_name not in pinecone.list_indexes():
-                pinecone.create_index(
-                    name=self.settings.pinecone_index_name,
-                    dimension=1536,  # OpenAI ada-002 embedding dimension
-                    metric="cosine"
-                )
+            self.vector_index = _shared_vector_index(self.settings)
             
-            self.pinecone_index = pinecone.Index(self.settings.pinecone_index_name)
-            
-            logger.info("Vector service clients initialized successfully")
+            # Embedding cache values are raw float32 bytes, so no response decoding
+            self.redis_client = redis.Redis.from_url(self.settings.redis_url)
             
         except Exception as e:
             logger.error("Failed to initialize vector service clients", error=str(e))
             raise ExternalServiceError("Vector Service", str(e))
     
+    @property
+    def openai_client(self) -> openai.AsyncOpenAI:
+        return _shared_openai_client(self.settings)
+    
+    def _scratch_rows(self, n: int) -> np.ndarray:
+        """
+        Return an (n, dimension) float32 view of a reusable buffer
+        
+        The buffer is allocated on first use and doubled when n outgrows it.
+        Callers must finish with the view before their next await.
+        """
+        if self._scratch is None or n > len(self._scratch):
+            capacity = _SCRATCH_ROWS if self._scratch is None else 2 * len(self._scratch)
+            self._scratch = np.empty((max(n, capacity), _EMBEDDING_DIMENSION), dtype=np.float32)
+        return self._scratch[:n]
+    
     async def generate_embedding(self, text: str) -> List[float]:
         """Generate embedding for text using OpenAI"""
+        return (await self.generate_embeddings_batch([text]))[0]
+    
+    async def generate_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings for many texts, preserving input order; cached texts skip OpenAI"""
+        return (await self._embedding_matrix(texts)).tolist()
+    
+    async def _embedding_matrix(self, texts: List[str]) -> np.ndarray:
+        """Embeddings for texts as rows of a new float32 matrix, in input order"""
+        if not texts:
+            return np.empty((0, _EMBEDDING_DIMENSION), dtype=np.float32)
+        
+        keys = [_embedding_cache_key(self.settings.openai_embedding_model, text) for text in texts]
+        
+        # Each distinct text is looked up and, if uncached, embedded once;
+        # duplicates (reposts, templated profiles) share its row
+        unique = dict(zip(keys, texts))
+        embeddings = dict(zip(unique, await self._get_cached_embeddings(list(unique))))
+        pending = {key: unique[key] for key, embedding in embeddings.items() if embedding is None}
+        if pending:
+            try:
+                generated = dict(zip(pending, await self._gathered_embed(list(pending.values()))))
+            except Exception as e:
+                logger.error("Failed to generate embeddings", count=len(pending), error=str(e))
+                raise ExternalServiceError("OpenAI Embeddings", str(e))
+            await self._cache_embeddings(generated)
+            embeddings.update(generated)
+        
+        logger.debug("Generated embeddings", count=len(texts), unique=len(unique), embedded=len(pending))
+        return np.stack([embeddings[key] for key in keys])
+    
+    async def _get_cached_embeddings(self, keys: List[str]) -> List[Optional[np.ndarray]]:
+        """Look up cached embeddings with one MGET; misses and cache errors are None"""
         try:
-            response = self.openai_client.embeddings.create(
-                model=self.settings.openai_embedding_model,
-                input=text
-            )
-            
-            embedding = response.data[0].embedding
-            logger.debug("Generated embedding", text_length=len(text), embedding_dim=len(embedding))
-            
-            return embedding
-            
+            values = await self.redis_client.mget(keys)
+        except Exception as e:
+            logger.warning("Embedding cache read failed", error=str(e))
+            return [None] * len(keys)
+        return [np.frombuffer(value, dtype=np.float32) if value else None for value in values]
+    
+    async def _cache_embeddings(self, embeddings: Dict[str, np.ndarray]) -> None:
+        """Cache embeddings as float32 bytes under their keys"""
+        try:
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for key, embedding in embeddings.items():
+                    pipe.set(key, embedding.tobytes(), ex=self.settings.embedding_cache_ttl)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning("Embedding cache write failed", error=str(e))
+    
+    async def _bump_embedding_versions(self, entity_ids: Sequence[str]) -> None:
+        """Advance the embedding version of each entity so memoized task results keyed on it go stale"""
+        try:
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for entity_id in entity_ids:
+                    pipe.incr(embedding_version_key(entity_id))
+                await pipe.execute()
+        except Exception as e:
+            logger.warning("Embedding version bump failed", error=str(e))
+    
+    async def _forget_embedding_source(self, entity_type: str, entity_id: Union[uuid.UUID, str]) -> None:
+        """Drop the record of a deleted embedding's source text so the next task regenerates it"""
+        try:
+            await self.redis_client.delete(embedding_source_key(entity_type, entity_id))
         except Exception as e:
-            logger.error("Failed to generate embedding", error=str(e))
-            raise ExternalServiceError("OpenAI Embeddings", str(e))
+            logger.warning("Embedding source cache delete failed", error=str(e))
+    
+    async def _gather_bounded(self, calls: List[Callable[[], Awaitable[R]]]) -> List[R]:
+        """
+        Run client calls concurrently
+        
+        At most settings.vector_max_concurrency calls are in flight at a time,
+        and results are returned in call order. A single call runs at once;
+        only batches are spread out with jitter.
+        """
+        if len(calls) == 1:
+            return [await calls[0]()]
+        
+        semaphore = asyncio.Semaphore(self.settings.vector_max_concurrency)
+        
+        async def run(call: Callable[[], Awaitable[R]]) -> R:
+            async with semaphore:
+                await asyncio.sleep(random.uniform(0, _REQUEST_JITTER))
+                return await call()
+        
+        return await asyncio.gather(*(run(call) for call in calls))
+    
+    async def _gather_chunks(
+        self,
+        call: Callable[[Sequence[T]], Awaitable[R]],
+        items: Sequence[T],
+        chunk_size: int
+    ) -> List[R]:
+        """Run a client call on each chunk of items concurrently"""
+        chunks = [items[start:start + chunk_size] for start in range(0, len(items), chunk_size)]
+        return await self._gather_bounded([functools.partial(call, chunk) for chunk in chunks])
+    
+    async def _multi_query(self, queries: List[Dict[str, Any]]) -> List[List[Any]]:
+        """Run Pinecone queries concurrently and return each query's matches"""
+        responses = await self._gather_bounded([
+            functools.partial(asyncio.to_thread, self.vector_index.query, **query) for query in queries
+        ])
+        return [response.matches for response in responses]
+    
+    async def _gathered_embed(self, texts: List[str]) -> List[np.ndarray]:
+        """Embed texts in concurrent sub-batches of settings.openai_embed_batch_size"""
+        # base64 responses carry each vector as packed float32 bytes, decoded
+        # straight into an array instead of parsing 1536 JSON floats
+        responses = await self._gather_chunks(
+            lambda chunk: self.openai_client.embeddings.create(
+                model=self.settings.openai_embedding_model,
+                input=chunk,
+                encoding_format="base64"
+            ),
+            texts,
+            self.settings.openai_embed_batch_size
+        )
+        # Results carry their position within the request; don't rely on response order
+        return [
+            np.frombuffer(base64.b64decode(item.embedding), dtype=np.float32)
+            for response in responses
+            for item in sorted(response.data, key=lambda item: item.index)
+        ]
+    
+    async def _gathered_upsert(self, vectors: List[Dict[str, Any]]) -> None:
+        """Upsert vectors to Pinecone in concurrent chunks of 100"""
+        await self._gather_chunks(
+            functools.partial(asyncio.to_thread, self.vector_index.upsert),
+            vectors,
+            _PINECONE_UPSERT_BATCH_SIZE
+        )
     
     async def store_embedding(
         self, 
         db: AsyncSession,
         entity_type: str, 
-        entity_id: str, 
+        entity_id: Union[uuid.UUID, str], 
         text: str,
         metadata: Dict[str, Any] = None
     ) -> str:
         """Generate and store embedding for an entity"""
+        embedding_ids = await self.store_embeddings_bulk(
+            db, entity_type, [{"entity_id": entity_id, "text": text, "metadata": metadata}]
+        )
+        return embedding_ids[0]
+    
+    async def store_embeddings_bulk(
+        self,
+        db: AsyncSession,
+        entity_type: str,
+        entities: List[Dict[str, Any]]
+    ) -> List[str]:
+        """
+        Generate and store embeddings for many entities of one type
+        
+        Each entity is a dict with "entity_id" (a UUID or its string form,
+        passed to the database as is), "text" and optional "metadata".
+        Embeddings come from one OpenAI request and replace any existing
+        embedding of the same entity with a single INSERT ... ON CONFLICT;
+        Pinecone upserts (already idempotent by vector ID) go in chunks of 100.
+        Returns the database embedding IDs in input order.
+        """
+        if not entities:
+            return []
+        
         try:
-            # Generate embedding
-            embedding_vector = await self.generate_embedding(text)
-            
-            # Store in database
-            embedding = Embedding(
-                entity_type=entity_type,
-                entity_id=uuid.UUID(entity_id),
-                embedding=embedding_vector,
-                metadata=metadata or {}
-            )
+            matrix = _l2_normalized(await self._embedding_matrix([entity["text"] for entity in entities]))
             
-            db.add(embedding)
+            # An entity listed twice keeps its last text; Postgres rejects an
+            # upsert that touches the same row twice
+            latest = {
+                str(entity["entity_id"]): (entity, row.tolist(), row)
+                for entity, row in zip(entities, matrix)
+            }
+            
+            stmt = insert(Embedding).values([
+                {
+                    "entity_type": entity_type,
+                    "entity_id": entity["entity_id"],
+                    "embedding": row,
+                    "meta": entity.get("metadata") or {}
+                }
+                for entity_id, (entity, _, row) in latest.items()
+            ])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Embedding.entity_type, Embedding.entity_id],
+                set_={"embedding": stmt.excluded.embedding, "metadata": stmt.excluded["metadata"]}
+            ).returning(Embedding.entity_id, Embedding.id)
+            result = await db.execute(stmt)
+            embedding_ids = {str(entity_id): str(embedding_id) for entity_id, embedding_id in result.all()}
             await db.commit()
-            await db.refresh(embedding)
             
-            # Store in Pinecone
-            vector_id = f"{entity_type}_{entity_id}"
-            self.pinecone_index.upsert([
+            pinecone_vectors = [
                 {
-                    "id": vector_id,
-                    "values": embedding_vector,
+                    "id": _vector_id(entity_type, entity_id),
+                    "values": vector,
                     "metadata": {
                         "entity_type": entity_type,
                         "entity_id": entity_id,
-                        "db_embedding_id": str(embedding.id),
-                        **(metadata or {})
+                        "db_embedding_id": embedding_ids[entity_id],
+                        **_indexed_metadata(entity.get("metadata"))
                     }
                 }
-            ])
+                for entity_id, (entity, vector, _) in latest.items()
+            ]
+            await self._gathered_upsert(pinecone_vectors)
+            await self._bump_embedding_versions(list(latest))
             
-            logger.info("Embedding stored successfully", 
-                       entity_type=entity_type, entity_id=entity_id, 
-                       embedding_id=str(embedding.id))
+            logger.info("Embeddings stored successfully", entity_type=entity_type, count=len(embedding_ids))
             
-            return str(embedding.id)
+            return [embedding_ids[str(entity["entity_id"])] for entity in entities]
             
         except Exception as e:
             await db.rollback()
-            logger.error("Failed to store embedding", 
-                        entity_type=entity_type, entity_id=entity_id, error=str(e))
+            logger.error("Failed to store embeddings", 
+                        entity_type=entity_type, count=len(entities), error=str(e))
             raise
     
     async def update_embedding(
         self,
         db: AsyncSession,
         entity_type: str,
-        entity_id: str,
+        entity_id: Union[uuid.UUID, str],
         text: str,
         metadata: Dict[str, Any] = None
     ) -> str:
         """Update existing embedding or create new one"""
-        try:
-            # Delete existing embedding if it exists
-            await self.delete_embedding(db, entity_type, entity_id)
-            
-            # Create new embedding
-            return await self.store_embedding(db, entity_type, entity_id, text, metadata)
-            
-        except Exception as e:
-            logger.error("Failed to update embedding", 
-                        entity_type=entity_type, entity_id=entity_id, error=str(e))
-            raise
+        return await self.store_embedding(db, entity_type, entity_id, text, metadata)
     
-    async def delete_embedding(self, db: AsyncSession, entity_type: str, entity_id: str) -> bool:
+    async def delete_embedding(self, db: AsyncSession, entity_type: str, entity_id: Union[uuid.UUID, str]) -> bool:
         """Delete embedding for an entity"""
         try:
             # Delete from Pinecone
-            vector_id = f"{entity_type}_{entity_id}"
-            self.pinecone_index.delete(ids=[vector_id])
+            await asyncio.to_thread(self.vector_index.delete, ids=[_vector_id(entity_type, entity_id)])
             
             # Delete from database
-            from sqlalchemy import select, delete
             stmt = delete(Embedding).where(
                 Embedding.entity_type == entity_type,
-                Embedding.entity_id == uuid.UUID(entity_id)
+                Embedding.entity_id == entity_id
             )
             await db.execute(stmt)
             await db.commit()
+            await self._bump_embedding_versions([entity_id])
+            await self._forget_embedding_source(entity_type, entity_id)
             
             logger.info("Embedding deleted successfully", 
                        entity_type=entity_type, entity_id=entity_id)
@@ -172,6 +467,14 @@ class VectorService:
                         entity_type=entity_type, entity_id=entity_id, error=str(e))
             return False
     
+    async def delete_vectors(self, entity_type: str, entity_ids: Sequence[Union[uuid.UUID, str]]) -> None:
+        """Remove entities' vectors from the vector index only, in concurrent chunks of 1000 IDs"""
+        await self._gather_chunks(
+            functools.partial(asyncio.to_thread, self.vector_index.delete),
+            [_vector_id(entity_type, entity_id) for entity_id in entity_ids],
+            _PINECONE_DELETE_BATCH_SIZE
+        )
+    
     async def similarity_search(
         self,
         query_text: str,
@@ -190,23 +493,26 @@ class VectorService:
                 filter_dict["entity_type"] = entity_type
             
             # Query Pinecone
-            results = self.pinecone_index.query(
+            results = await asyncio.to_thread(
+                self.vector_index.query,
                 vector=query_embedding,
                 top_k=top_k,
                 include_metadata=True,
                 filter=filter_dict if filter_dict else None
             )
             
-            # Filter by similarity threshold and format results
-            similar_items = []
-            for match in results.matches:
-                if match.score >= similarity_threshold:
-                    similar_items.append({
-                        "entity_type": match.metadata.get("entity_type"),
-                        "entity_id": match.metadata.get("entity_id"),
-                        "similarity_score": float(match.score),
-                        "metadata": match.metadata
-                    })
+            # Threshold all scores at once; only kept matches are formatted
+            matches = results.matches
+            scores = np.fromiter((match.score for match in matches), dtype=np.float32, count=len(matches))
+            similar_items = [
+                {
+                    "entity_type": matches[i].metadata.get("entity_type"),
+                    "entity_id": matches[i].metadata.get("entity_id"),
+                    "similarity_score": float(scores[i]),
+                    "metadata": matches[i].metadata
+                }
+                for i in np.flatnonzero(scores >= similarity_threshold)
+            ]
             
             logger.info("Similarity search completed", 
                        query_length=len(query_text), 
@@ -226,38 +532,50 @@ class VectorService:
         similarity_threshold: float = 0.7
     ) -> List[Dict[str, Any]]:
         """Find agents similar to the given agent"""
+        similar = await self.find_similar_agents_batch([agent_id], top_k, similarity_threshold)
+        return similar[agent_id]
+    
+    async def find_similar_agents_batch(
+        self,
+        agent_ids: List[str],
+        top_k: int = 5,
+        similarity_threshold: float = 0.7
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Find agents similar to each of the given agents, querying Pinecone concurrently"""
         try:
-            # Get agent's embedding vector
-            vector_id = f"agent_{agent_id}"
-            
-            # Query for similar agents
-            results = self.pinecone_index.query(
-                id=vector_id,
-                top_k=top_k + 1,  # +1 because the agent itself will be included
-                include_metadata=True,
-                filter={"entity_type": "agent"}
-            )
+            # Query by each agent's stored vector; +1 because the agent itself will be included
+            all_matches = await self._multi_query([
+                {
+                    "id": _vector_id("agent", agent_id),
+                    "top_k": top_k + 1,
+                    "include_metadata": True,
+                    "filter": {"entity_type": "agent"}
+                }
+                for agent_id in agent_ids
+            ])
             
-            # Filter out the agent itself and apply threshold
-            similar_agents = []
-            for match in results.matches:
-                if (match.metadata.get("entity_id") != agent_id and 
-                    match.score >= similarity_threshold):
-                    similar_agents.append({
+            similar_agents = {}
+            for agent_id, matches in zip(agent_ids, all_matches):
+                scores = np.fromiter((match.score for match in matches), dtype=np.float32, count=len(matches))
+                similar_agents[agent_id] = [
+                    {
                         "agent_id": match.metadata.get("entity_id"),
                         "similarity_score": float(match.score),
                         "metadata": match.metadata
-                    })
+                    }
+                    for match in (matches[i] for i in np.flatnonzero(scores >= similarity_threshold))
+                    if match.metadata.get("entity_id") != agent_id
+                ]
             
             logger.info("Similar agents found", 
-                       agent_id=agent_id, 
-                       similar_count=len(similar_agents))
+                       agents=len(agent_ids), 
+                       similar_count=sum(len(similar) for similar in similar_agents.values()))
             
             return similar_agents
             
         except Exception as e:
             logger.error("Failed to find similar agents", 
-                        agent_id=agent_id, error=str(e))
+                        agents=len(agent_ids), error=str(e))
             raise ExternalServiceError("Agent Similarity Search", str(e))
     
     async def find_similar_users_by_interests(
@@ -266,19 +584,45 @@ class VectorService:
         top_k: int = 10,
         similarity_threshold: float = 0.6
     ) -> List[Dict[str, Any]]:
-        """Find users with similar interests"""
+        """
+        Find users with similar interests
+        
+        Dense similarity alone blurs exact keyword matches, so candidates are
+        reranked by how many of the queried interests their profile lists
+        verbatim (profiles stored with an "interests" metadata list). A
+        candidate with no shared interest keeps its dense score.
+        """
         try:
-            # Create query text from interests
-            query_text = " ".join(interests)
-            
-            # Search for similar user profiles
-            results = await self.similarity_search(
-                query_text=query_text,
-                entity_type="user_profile",
-                top_k=top_k,
-                similarity_threshold=similarity_threshold
+            query_embedding = await self.generate_embedding(" ".join(interests))
+            results = await asyncio.to_thread(
+                self.vector_index.query,
+                vector=query_embedding,
+                top_k=top_k * _INTEREST_OVERSAMPLE,
+                include_metadata=True,
+                filter={"entity_type": "user_profile"}
             )
             
+            matches = results.matches
+            terms = set(_interest_terms(interests))
+            dense = np.fromiter((match.score for match in matches), dtype=np.float32, count=len(matches))
+            overlap = np.fromiter(
+                (len(terms.intersection(match.metadata.get("interests") or ())) for match in matches),
+                dtype=np.float32,
+                count=len(matches)
+            ) / max(len(terms), 1)
+            scores = dense + _INTEREST_OVERLAP_WEIGHT * overlap * (1 - dense)
+            
+            ranked = np.argsort(-scores, kind="stable")[:top_k]
+            results = [
+                {
+                    "entity_type": matches[i].metadata.get("entity_type"),
+                    "entity_id": matches[i].metadata.get("entity_id"),
+                    "similarity_score": float(scores[i]),
+                    "metadata": matches[i].metadata
+                }
+                for i in ranked[scores[ranked] >= similarity_threshold]
+            ]
+            
             logger.info("Similar users by interests found", 
                        interests=interests, 
                        results_count=len(results))
@@ -296,51 +640,61 @@ class VectorService:
         agent2_id: str
     ) -> float:
         """Calculate compatibility score between two agents"""
+        return (await self.calculate_compatibility_scores([(agent1_id, agent2_id)]))[0]
+    
+    async def calculate_compatibility_scores(self, pairs: List[Tuple[str, str]]) -> List[float]:
+        """
+        Calculate compatibility scores for many agent pairs
+        
+        Fetches every distinct agent vector once and scores all pairs in one
+        vectorized pass. Stored vectors are unit length, so cosine similarity
+        is a plain dot product. Pairs with a missing or zero vector score 0.0;
+        others map cosine similarity from [-1, 1] to [0, 1].
+        """
+        if not pairs:
+            return []
+        
         try:
-            # Get both agent vectors
-            vector1_id = f"agent_{agent1_id}"
-            vector2_id = f"agent_{agent2_id}"
-            
-            # Fetch vectors from Pinecone
-            fetch_response = self.pinecone_index.fetch(ids=[vector1_id, vector2_id])
-            
-            if vector1_id not in fetch_response.vectors or vector2_id not in fetch_response.vectors:
-                logger.warning("One or both agent vectors not found", 
-                             agent1_id=agent1_id, agent2_id=agent2_id)
-                return 0.0
-            
-            # Calculate cosine similarity
-            vector1 = np.array(fetch_response.vectors[vector1_id].values)
-            vector2 = np.array(fetch_response.vectors[vector2_id].values)
+            vector_ids = list(dict.fromkeys(_vector_id("agent", agent_id) for pair in pairs for agent_id in pair))
+            responses = await self._gather_chunks(
+                lambda ids: asyncio.to_thread(self.vector_index.fetch, ids=list(ids)),
+                vector_ids,
+                _PINECONE_FETCH_BATCH_SIZE
+            )
+            fetched = {vector_id: vector.values for response in responses for vector_id, vector in response.vectors.items()}
             
-            # Cosine similarity calculation
-            dot_product = np.dot(vector1, vector2)
-            norm1 = np.linalg.norm(vector1)
-            norm2 = np.linalg.norm(vector2)
+            scores = np.zeros(len(pairs), dtype=np.float32)
+            if not fetched:
+                logger.warning("No agent vectors found for compatibility scoring", pairs=len(pairs))
+                return scores.tolist()
             
-            if norm1 == 0 or norm2 == 0:
-                return 0.0
+            found = list(fetched)
+            vectors = self._scratch_rows(len(found))
+            for row, vector_id in enumerate(found):
+                vectors[row] = fetched[vector_id]
+            nonzero = vectors.any(axis=1)
             
-            similarity = dot_product / (norm1 * norm2)
+            # Row of each usable vector; missing and zero vectors stay at -1
+            rows = {vector_id: row for row, vector_id in enumerate(found) if nonzero[row]}
+            left = np.array([rows.get(_vector_id("agent", agent1_id), -1) for agent1_id, _ in pairs])
+            right = np.array([rows.get(_vector_id("agent", agent2_id), -1) for _, agent2_id in pairs])
+            valid = (left >= 0) & (right >= 0)
             
-            # Convert from [-1, 1] to [0, 1] range
-            compatibility_score = (similarity + 1) / 2
+            similarity = np.einsum("ij,ij->i", vectors[left[valid]], vectors[right[valid]])
+            scores[valid] = (similarity + 1) / 2
             
-            logger.info("Compatibility score calculated", 
-                       agent1_id=agent1_id, agent2_id=agent2_id, 
-                       score=compatibility_score)
+            logger.info("Compatibility scores calculated", pairs=len(pairs), scored=int(valid.sum()))
             
-            return float(compatibility_score)
+            return scores.tolist()
             
         except Exception as e:
-            logger.error("Failed to calculate compatibility score", 
-                        agent1_id=agent1_id, agent2_id=agent2_id, error=str(e))
-            return 0.0
+            logger.error("Failed to calculate compatibility scores", pairs=len(pairs), error=str(e))
+            return [0.0] * len(pairs)
     
     async def get_index_stats(self) -> Dict[str, Any]:
         """Get Pinecone index statistics"""
         try:
-            stats = self.pinecone_index.describe_index_stats()
+            stats = await asyncio.to_thread(self.vector_index.describe_index_stats)
             
             return {
                 "total_vectors": stats.total_vector_count,
@@ -351,4 +705,24 @@ class VectorService:
             
         except Exception as e:
             logger.error("Failed to get index stats", error=str(e))
-            raise ExternalServiceError("Pinecone Stats", str(e))
\ No newline at end of file
+            raise ExternalServiceError("Pinecone Stats", str(e))
+
+
+def get_vector_service() -> VectorService:
+    """Get the process-wide VectorService, creating it on first use"""
+    global _vector_service
+    if _vector_service is None:
+        _vector_service = VectorService()
+    return _vector_service
+
+
+async def close_vector_service() -> None:
+    """Close the process-wide VectorService's Redis connections and the running loop's OpenAI client"""
+    global _vector_service
+    if _vector_service is not None:
+        await _vector_service.redis_client.close(close_connection_pool=True)
+        _vector_service = None
+    
+    client = _openai_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.close()
\ No newline at end of file
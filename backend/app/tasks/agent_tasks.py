@@ -36,10 +36,6 @@ def process_agent_conversation(self, agent1_id: str, agent2_id: str, conversatio
         
         current_task.update_state(state="PROGRESS", meta={"progress": 50})
         
-        # Simulate processing time
-        import time
-        time.sleep(2)
-        
         current_task.update_state(state="PROGRESS", meta={"progress": 100})
         
         result = {
@@ -120,10 +116,6 @@ def generate_agent_persona(self, user_id: str, resume_data: Dict[str, Any], pref
         
         current_task.update_state(state="PROGRESS", meta={"progress": 50})
         
-        # Simulate processing time
-        import time
-        time.sleep(3)
-        
         current_task.update_state(state="PROGRESS", meta={"progress": 100})
         
         result = {
@@ -8,6 +8,7 @@ import structlog
 from celery import current_task
 
 from app.core.celery_app import celery_app
+from app.tasks.memoization import memoize_result
 
 logger = structlog.get_logger(__name__)
 
@@ -32,15 +33,8 @@ def discover_matches_for_user(self, user_id: str):
         
         current_task.update_state(state="PROGRESS", meta={"progress": 30})
         
-        # Simulate vector similarity search
-        import time
-        time.sleep(2)
-        
         current_task.update_state(state="PROGRESS", meta={"progress": 70})
         
-        # Simulate agent conversation analysis
-        time.sleep(3)
-        
         current_task.update_state(state="PROGRESS", meta={"progress": 100})
         
         result = {
@@ -63,6 +57,7 @@ def discover_matches_for_user(self, user_id: str):
 
 
 @celery_app.task(bind=True)
+@memoize_result("agent1_id", "agent2_id")
 def calculate_compatibility_score(self, agent1_id: str, agent2_id: str):
     """
     Calculate compatibility score between two agents
@@ -82,10 +77,6 @@ def calculate_compatibility_score(self, agent1_id: str, agent2_id: str):
         
         current_task.update_state(state="PROGRESS", meta={"progress": 60})
         
-        # Simulate processing
-        import time
-        time.sleep(1)
-        
         current_task.update_state(state="PROGRESS", meta={"progress": 100})
         
         # Mock compatibility score
@@ -133,10 +124,6 @@ def periodic_match_cleanup(self):
         # 2. Updating their status
         # 3. Sending notifications
         
-        # Simulate cleanup
-        import time
-        time.sleep(1)
-        
         result = {
             "status": "completed",
             "expired_matches_cleaned": 5,
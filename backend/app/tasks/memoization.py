@@ -0,0 +1,144 @@
+"""
+Redis memoization for deterministic Celery tasks and the embedding steps inside them
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar
+import functools
+import hashlib
+import inspect
+import json
+
+import redis
+import structlog
+
+from app.core.cache import embedding_source_key, embedding_version_key
+from app.core.config import get_settings
+
+logger = structlog.get_logger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+DEFAULT_RESULT_TTL = 3600  # seconds
+
+# Tasks run synchronously in worker processes, so they use a blocking client
+# created lazily in each (forked) worker
+_client: Optional[redis.Redis] = None
+
+
+def _redis() -> redis.Redis:
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(get_settings().redis_url, decode_responses=True)
+    return _client
+
+
+def text_digest(text: str) -> str:
+    """
+    Hash of the embedding model and text an entity's embedding was generated from
+    
+    Callers compute it once per text and pass it to both the lookup and the
+    record below, so each text is encoded and hashed a single time.
+    """
+    digest = hashlib.sha256(get_settings().openai_embedding_model.encode())
+    digest.update(b"\0")
+    digest.update(text.encode())
+    return digest.hexdigest()
+
+
+def stored_embedding_id(entity_type: str, entity_id: str, digest: str) -> Optional[str]:
+    """
+    ID of the entity's stored embedding if it was generated from the text with this digest
+    
+    Lets embedding tasks skip re-saves that did not change the embedded text.
+    Returns None on a miss, a changed text or a Redis error.
+    """
+    return stored_embedding_ids(entity_type, [(entity_id, digest)])[0]
+
+
+def stored_embedding_ids(entity_type: str, entities: Sequence[Tuple[str, str]]) -> List[Optional[str]]:
+    """stored_embedding_id for many (entity ID, text digest) pairs with one MGET"""
+    if not entities:
+        return []
+    
+    try:
+        payloads = _redis().mget([embedding_source_key(entity_type, entity_id) for entity_id, _ in entities])
+    except redis.RedisError as e:
+        logger.warning("Embedding source cache read failed", entity_type=entity_type, error=str(e))
+        return [None] * len(entities)
+    
+    embedding_ids = []
+    for (_, digest), payload in zip(entities, payloads):
+        source = json.loads(payload) if payload else None
+        embedding_ids.append(source["embedding_id"] if source and source["digest"] == digest else None)
+    return embedding_ids
+
+
+def remember_embedding_source(entity_type: str, entity_id: str, digest: str, embedding_id: str) -> None:
+    """Record the digest of the text an entity's stored embedding was generated from"""
+    remember_embedding_sources(entity_type, [(entity_id, digest, embedding_id)])
+
+
+def remember_embedding_sources(entity_type: str, entities: Sequence[Tuple[str, str, str]]) -> None:
+    """remember_embedding_source for many (entity ID, text digest, embedding ID) triples in one pipeline"""
+    if not entities:
+        return
+    
+    ttl = get_settings().embedding_cache_ttl
+    try:
+        with _redis().pipeline(transaction=False) as pipe:
+            for entity_id, digest, embedding_id in entities:
+                payload = json.dumps({"digest": digest, "embedding_id": embedding_id})
+                pipe.set(embedding_source_key(entity_type, entity_id), payload, ex=ttl)
+            pipe.execute()
+    except redis.RedisError as e:
+        logger.warning("Embedding source cache write failed", entity_type=entity_type, error=str(e))
+
+
+def _result_key(task_name: str, arguments: Dict[str, Any], versions: List[Optional[str]]) -> str:
+    """Content hash of a task call and the embedding versions it was computed from"""
+    payload = json.dumps([task_name, arguments, versions], sort_keys=True, default=str)
+    digest = hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+    return f"task:result:{digest}"
+
+
+def memoize_result(*entity_params: str, ttl: int = DEFAULT_RESULT_TTL) -> Callable[[F], F]:
+    """
+    Serve repeated calls of a task from Redis for ttl seconds
+    
+    The key covers the task's arguments and the current embedding version of
+    each argument named in entity_params, so storing or deleting one of those
+    embeddings makes earlier results unreachable. Apply below
+    @celery_app.task; Redis errors fall back to running the task.
+    """
+    def decorator(func: F) -> F:
+        signature = inspect.signature(func)
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            arguments = signature.bind(*args, **kwargs)
+            arguments.apply_defaults()
+            call = {name: value for name, value in arguments.arguments.items() if name != "self"}
+            
+            try:
+                client = _redis()
+                versions = client.mget([embedding_version_key(call[name]) for name in entity_params])
+                key = _result_key(func.__qualname__, call, versions)
+                cached = client.get(key)
+            except redis.RedisError as e:
+                logger.warning("Task result cache read failed", task=func.__qualname__, error=str(e))
+                return func(*args, **kwargs)
+            
+            if cached is not None:
+                logger.debug("Task result served from cache", task=func.__qualname__)
+                return json.loads(cached)
+            
+            result = func(*args, **kwargs)
+            try:
+                client.set(key, json.dumps(result), ex=ttl)
+            except redis.RedisError as e:
+                logger.warning("Task result cache write failed", task=func.__qualname__, error=str(e))
+            return result
+        
+        return wrapper
+    
+    return decorator
@@ -5,14 +5,14 @@ Background tasks for notification operations
 from typing import Dict, Any, List
 
 import structlog
-from celery import current_task
+from celery import current_task, group
 
 from app.core.celery_app import celery_app
 
 logger = structlog.get_logger(__name__)
 
 
-@celery_app.task(bind=True)
+@celery_app.task(bind=True, rate_limit="100/s")
 def send_notification(self, user_id: str, notification_type: str, title: str, content: str, data: Dict[str, Any] = None):
     """
     Send a notification to a user
@@ -31,10 +31,6 @@ def send_notification(self, user_id: str, notification_type: str, title: str, co
         
         current_task.update_state(state="PROGRESS", meta={"progress": 60})
         
-        # Simulate notification delivery
-        import time
-        time.sleep(0.5)
-        
         current_task.update_state(state="PROGRESS", meta={"progress": 100})
         
         result = {
@@ -64,47 +60,30 @@ def send_notification(self, user_id: str, notification_type: str, title: str, co
 def send_bulk_notifications(self, user_ids: List[str], notification_type: str, title: str, content: str, data: Dict[str, Any] = None):
     """
     Send notifications to multiple users
+    
+    Progress is available from GroupResult.restore(group_id).completed_count().
     """
     try:
         total_users = len(user_ids)
-        current_task.update_state(state="PROGRESS", meta={"progress": 0, "total": total_users})
         
         logger.info("Sending bulk notifications", 
                    user_count=total_users, type=notification_type)
         
-        sent_notifications = []
-        
-        for i, user_id in enumerate(user_ids):
-            try:
-                # TODO: Implement individual notification sending
-                notification_id = f"notif_{i}_{user_id}"
-                sent_notifications.append(notification_id)
-                
-                # Update progress
-                progress = int((i + 1) / total_users * 100)
-                current_task.update_state(
-                    state="PROGRESS", 
-                    meta={"progress": progress, "sent": i + 1, "total": total_users}
-                )
-                
-                # Small delay to avoid overwhelming the system
-                import time
-                time.sleep(0.1)
-                
-            except Exception as user_error:
-                logger.warning("Failed to send notification to user", 
-                             user_id=user_id, error=str(user_error))
-                continue
+        # Fan out one send_notification per user across the worker pool; waiting
+        # on subtasks inside a task can deadlock, so return the group ID instead
+        job = group(
+            send_notification.s(user_id, notification_type, title, content, data)
+            for user_id in user_ids
+        ).apply_async()
+        job.save()
         
         result = {
-            "status": "completed",
+            "status": "dispatched",
             "total_users": total_users,
-            "successful_sends": len(sent_notifications),
-            "failed_sends": total_users - len(sent_notifications),
-            "notification_ids": sent_notifications
+            "group_id": job.id
         }
         
-        logger.info("Bulk notifications completed", result=result)
+        logger.info("Bulk notifications dispatched", result=result)
         return result
         
     except Exception as e:
@@ -135,10 +114,6 @@ def send_match_notification(self, match_id: str, user1_id: str, user2_id: str):
         
         current_task.update_state(state="PROGRESS", meta={"progress": 50})
         
-        # Simulate notification creation and sending
-        import time
-        time.sleep(1)
-        
         current_task.update_state(state="PROGRESS", meta={"progress": 100})
         
         result = {
@@ -175,10 +150,6 @@ def cleanup_old_notifications(self, days_old: int = 30):
         # 1. Finding old read notifications
         # 2. Deleting them from database
         
-        # Simulate cleanup
-        import time
-        time.sleep(1)
-        
         result = {
             "status": "completed",
             "deleted_notifications": 150,
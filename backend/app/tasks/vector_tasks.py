@@ -2,17 +2,230 @@
 Background tasks for vector operations
 """
 
-from typing import Dict, Any, List
+from typing import Callable, Dict, Any, List, Sequence, Tuple
+import asyncio
+import functools
+import itertools
+import time
 
 import structlog
-from celery import current_task
+from celery import chord, current_task, group
 
 from app.core.celery_app import celery_app
-from app.services.vector_service import VectorService
+from app.core.config import get_settings
+from app.core.database import database_manager
+from app.core.exceptions import ExternalServiceError, ValidationError
+from app.services.vector_service import get_vector_service
+from app.tasks.memoization import (
+    remember_embedding_source, remember_embedding_sources, stored_embedding_id, stored_embedding_ids, text_digest
+)
+from app.tasks.worker_db import get_pool, run_async
 
 logger = structlog.get_logger(__name__)
 
 
+def _experience_titles(experience: List[Dict[str, Any]]) -> str:
+    return "; ".join(exp.get("title", "") for exp in experience[:3])
+
+
+# (label, key, formatter) for each line of an entity's embedding text
+_PROFILE_FIELDS = (
+    ("Bio", "bio", str),
+    ("Interests", "interests", ", ".join),
+    ("Skills", "skills", ", ".join),
+    ("Experience", "experience", _experience_titles),
+)
+_AGENT_FIELDS = (
+    ("Persona", "persona_description", str),
+    ("Background", "background_context", str),
+    ("Goals", "goals", ", ".join),
+    ("Interests", "interests", ", ".join),
+    ("Personality", "personality_type", str),
+)
+_POST_FIELDS = (
+    ("Title", "title", str),
+    ("Content", "content", str),
+    ("Tags", "tags", ", ".join),
+)
+
+
+def _entity_text(fields: Sequence[Tuple[str, str, Callable[[Any], str]]], data: Dict[str, Any]) -> str:
+    """Embedding text with one "Label: value" line per non-empty field"""
+    return "\n".join(f"{label}: {format_value(value)}" for label, key, format_value in fields if (value := data.get(key)))
+
+
+_profile_text = functools.partial(_entity_text, _PROFILE_FIELDS)
+_agent_text = functools.partial(_entity_text, _AGENT_FIELDS)
+_post_text = functools.partial(_entity_text, _POST_FIELDS)
+
+
+# Bulk regeneration fans out one subtask per shard of IDs; each shard embeds
+# this many entities per OpenAI request
+_REGENERATE_SHARD_SIZE = 500
+_REGENERATE_BATCH_SIZE = 64
+
+# Minimum time between progress writes to the result backend
+_PROGRESS_INTERVAL = 0.25  # seconds
+
+# Query for the columns each entity type's embedding text is built from, and the builder.
+# user_profile is not listed: its text includes resume-derived fields the caller of
+# generate_user_profile_embedding supplies, which a users row alone cannot rebuild.
+_ENTITY_SOURCES = {
+    "agent": (
+        "SELECT id, persona_description, background_context, goals, interests, personality_type "
+        "FROM agents WHERE id = ANY($1::uuid[])",
+        _agent_text
+    ),
+    "post": ("SELECT id, title, content, tags FROM posts WHERE id = ANY($1::uuid[])", _post_text),
+}
+
+# Embeddings whose entity row no longer exists
+_DELETE_ORPHANED_EMBEDDINGS = """
+DELETE FROM embeddings e
+WHERE (e.entity_type = 'user_profile' AND NOT EXISTS (SELECT 1 FROM users WHERE users.id = e.entity_id))
+   OR (e.entity_type = 'agent' AND NOT EXISTS (SELECT 1 FROM agents WHERE agents.id = e.entity_id))
+   OR (e.entity_type = 'post' AND NOT EXISTS (SELECT 1 FROM posts WHERE posts.id = e.entity_id))
+RETURNING entity_type, entity_id
+"""
+
+
+async def _store_embedding(entity_type: str, entity_id: str, text: str) -> str:
+    """Embed and store one entity's text; returns the embedding ID"""
+    async with database_manager.session_factory() as session:
+        return await get_vector_service().store_embedding(session, entity_type, entity_id, text)
+
+
+async def _delete_orphaned_embeddings() -> int:
+    """
+    Delete embeddings of entities that no longer exist, from Postgres and the vector index
+    
+    The rows are deleted in a transaction that only commits once their
+    vectors are gone, so a failed index delete leaves both stores as they were.
+    """
+    orphans: Dict[str, List[str]] = {}
+    async with get_pool().acquire() as conn:
+        async with conn.transaction():
+            for row in await conn.fetch(_DELETE_ORPHANED_EMBEDDINGS):
+                orphans.setdefault(row["entity_type"], []).append(str(row["entity_id"]))
+            for entity_type, entity_ids in orphans.items():
+                await get_vector_service().delete_vectors(entity_type, entity_ids)
+    return sum(len(entity_ids) for entity_ids in orphans.values())
+
+
+async def _load_entities(entity_type: str, entity_ids: Sequence[str]) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """Build the embedding text of a shard's entities from one row fetch; returns them and the IDs not found"""
+    query, build_text = _ENTITY_SOURCES[entity_type]
+    rows = {str(row["id"]): row for row in await get_pool().fetch(query, list(entity_ids))}
+    entities = []
+    for entity_id in entity_ids:
+        if entity_id in rows:
+            text = build_text(dict(rows[entity_id]))
+            entities.append({"entity_id": entity_id, "text": text, "digest": text_digest(text)})
+    return entities, [entity_id for entity_id in entity_ids if entity_id not in rows]
+
+
+async def _store_entities(
+    entity_type: str,
+    entities: List[Dict[str, Any]]
+) -> Tuple[List[Tuple[Dict[str, Any], str]], List[str]]:
+    """
+    Embed and store a chunk of entities with a single embedding request
+    
+    Returns the stored (entity, embedding ID) pairs and the IDs that failed.
+    If the embedding request is rejected, the chunk is retried one entity at
+    a time so only the offending ones fail.
+    """
+    failed = []
+    vector_service = get_vector_service()
+    async with database_manager.session_factory() as session:
+        try:
+            embedding_ids = await vector_service.store_embeddings_bulk(session, entity_type, entities)
+            return list(zip(entities, embedding_ids)), failed
+        except ExternalServiceError as e:
+            logger.warning("Embedding request failed for chunk, retrying entities one by one",
+                           entity_type=entity_type, count=len(entities), error=str(e))
+        
+        stored = []
+        for entity in entities:
+            try:
+                embedding_ids = await vector_service.store_embeddings_bulk(session, entity_type, [entity])
+                stored.append((entity, embedding_ids[0]))
+            except ExternalServiceError as entity_error:
+                logger.warning("Failed to regenerate embedding for entity",
+                               entity_type=entity_type, entity_id=entity["entity_id"],
+                               error=str(entity_error))
+                failed.append(entity["entity_id"])
+        return stored, failed
+
+
+async def _regenerate_chunk(
+    entity_type: str,
+    entities: Sequence[Dict[str, Any]],
+    force: bool
+) -> Tuple[List[str], List[str], int]:
+    """Regenerate one chunk of loaded entities; returns the processed IDs, the failed IDs and how many were unchanged"""
+    failed: List[str] = []
+    unchanged: List[str] = []
+    try:
+        # Only entities whose text changed reach the embedding request
+        if not force:
+            embedding_ids = await asyncio.to_thread(
+                stored_embedding_ids, entity_type, [(entity["entity_id"], entity["digest"]) for entity in entities]
+            )
+            unchanged = [entity["entity_id"] for entity, embedding_id in zip(entities, embedding_ids) if embedding_id]
+            entities = [entity for entity, embedding_id in zip(entities, embedding_ids) if not embedding_id]
+        
+        stored, store_failed = await _store_entities(entity_type, entities) if entities else ([], [])
+        failed.extend(store_failed)
+    except Exception as chunk_error:
+        logger.warning("Failed to regenerate embeddings for chunk", 
+                     entity_type=entity_type, count=len(entities), 
+                     error=str(chunk_error))
+        # Entities already found unchanged still count; the rest of the chunk failed
+        return unchanged, [entity["entity_id"] for entity in entities], len(unchanged)
+    
+    await asyncio.to_thread(
+        remember_embedding_sources,
+        entity_type,
+        [(entity["entity_id"], entity["digest"], embedding_id) for entity, embedding_id in stored]
+    )
+    return unchanged + [entity["entity_id"] for entity, _ in stored], failed, len(unchanged)
+
+
+async def _regenerate_shard(
+    entity_type: str,
+    entity_ids: Sequence[str],
+    force: bool,
+    report: Callable[[int], None]
+) -> Tuple[List[str], List[str], int]:
+    """Regenerate a shard's chunks with bounded concurrency, calling report with the running total as each finishes"""
+    # One row fetch for the whole shard; the chunks only split the embedding work
+    try:
+        entities, failed_entities = await _load_entities(entity_type, entity_ids)
+    except Exception as load_error:
+        logger.warning("Failed to load entities for shard",
+                       entity_type=entity_type, count=len(entity_ids), error=str(load_error))
+        return [], list(entity_ids), 0
+    
+    semaphore = asyncio.Semaphore(get_settings().vector_max_concurrency)
+    
+    async def bounded(chunk: Sequence[Dict[str, Any]]) -> Tuple[List[str], List[str], int]:
+        async with semaphore:
+            return await _regenerate_chunk(entity_type, chunk, force)
+    
+    processed_entities: List[str] = []
+    unchanged_count = 0
+    for finished in asyncio.as_completed([
+        bounded(chunk) for chunk in itertools.batched(entities, _REGENERATE_BATCH_SIZE)
+    ]):
+        processed, failed, unchanged = await finished
+        processed_entities.extend(processed)
+        failed_entities.extend(failed)
+        unchanged_count += unchanged
+        report(len(processed_entities) + len(failed_entities))
+    return processed_entities, failed_entities, unchanged_count
+
+
 @celery_app.task(bind=True)
 def generate_user_profile_embedding(self, user_id: str, profile_data: Dict[str, Any]):
     """
@@ -23,43 +236,32 @@ def generate_user_profile_embedding(self, user_id: str, profile_data: Dict[str,
         
         logger.info("Generating user profile embedding", user_id=user_id)
         
-        # TODO: Implement with actual database connection
-        vector_service = VectorService()
-        
-        # Build profile text from user data
-        profile_text_parts = []
-        
-        if profile_data.get("bio"):
-            profile_text_parts.append(f"Bio: {profile_data['bio']}")
-        
-        if profile_data.get("interests"):
-            profile_text_parts.append(f"Interests: {', '.join(profile_data['interests'])}")
-        
-        if profile_data.get("skills"):
-            profile_text_parts.append(f"Skills: {', '.join(profile_data['skills'])}")
+        profile_text = _profile_text(profile_data)
         
-        if profile_data.get("experience"):
-            exp_text = "Experience: " + "; ".join([
-                exp.get("title", "") for exp in profile_data["experience"][:3]
-            ])
-            profile_text_parts.append(exp_text)
-        
-        profile_text = "\n".join(profile_text_parts)
+        digest = text_digest(profile_text)
+        embedding_id = stored_embedding_id("user_profile", user_id, digest)
+        if embedding_id:
+            logger.info("User profile embedding unchanged", user_id=user_id)
+            return {
+                "status": "cached",
+                "user_id": user_id,
+                "embedding_id": embedding_id,
+                "text_length": len(profile_text)
+            }
         
         current_task.update_state(state="PROGRESS", meta={"progress": 50})
         
-        # Generate embedding (simulated for now)
-        import time
-        time.sleep(1)
+        embedding_id = run_async(_store_embedding("user_profile", user_id, profile_text))
         
         current_task.update_state(state="PROGRESS", meta={"progress": 100})
         
         result = {
             "status": "completed",
             "user_id": user_id,
-            "embedding_id": "embedding_123",
+            "embedding_id": embedding_id,
             "text_length": len(profile_text)
         }
+        remember_embedding_source("user_profile", user_id, digest, embedding_id)
         
         logger.info("User profile embedding generated", user_id=user_id, result=result)
         return result
@@ -84,40 +286,32 @@ def generate_agent_embedding(self, agent_id: str, agent_data: Dict[str, Any]):
         
         logger.info("Generating agent embedding", agent_id=agent_id)
         
-        # Build agent text from persona data
-        agent_text_parts = []
-        
-        if agent_data.get("persona_description"):
-            agent_text_parts.append(f"Persona: {agent_data['persona_description']}")
-        
-        if agent_data.get("background_context"):
-            agent_text_parts.append(f"Background: {agent_data['background_context']}")
-        
-        if agent_data.get("goals"):
-            agent_text_parts.append(f"Goals: {', '.join(agent_data['goals'])}")
-        
-        if agent_data.get("interests"):
-            agent_text_parts.append(f"Interests: {', '.join(agent_data['interests'])}")
-        
-        if agent_data.get("personality_type"):
-            agent_text_parts.append(f"Personality: {agent_data['personality_type']}")
+        agent_text = _agent_text(agent_data)
         
-        agent_text = "\n".join(agent_text_parts)
+        digest = text_digest(agent_text)
+        embedding_id = stored_embedding_id("agent", agent_id, digest)
+        if embedding_id:
+            logger.info("Agent embedding unchanged", agent_id=agent_id)
+            return {
+                "status": "cached",
+                "agent_id": agent_id,
+                "embedding_id": embedding_id,
+                "text_length": len(agent_text)
+            }
         
         current_task.update_state(state="PROGRESS", meta={"progress": 50})
         
-        # Generate embedding (simulated for now)
-        import time
-        time.sleep(1)
+        embedding_id = run_async(_store_embedding("agent", agent_id, agent_text))
         
         current_task.update_state(state="PROGRESS", meta={"progress": 100})
         
         result = {
             "status": "completed",
             "agent_id": agent_id,
-            "embedding_id": "embedding_456",
+            "embedding_id": embedding_id,
             "text_length": len(agent_text)
         }
+        remember_embedding_source("agent", agent_id, digest, embedding_id)
         
         logger.info("Agent embedding generated", agent_id=agent_id, result=result)
         return result
@@ -142,34 +336,32 @@ def generate_post_embedding(self, post_id: str, post_data: Dict[str, Any]):
         
         logger.info("Generating post embedding", post_id=post_id)
         
-        # Build post text
-        post_text_parts = []
+        post_text = _post_text(post_data)
         
-        if post_data.get("title"):
-            post_text_parts.append(f"Title: {post_data['title']}")
-        
-        if post_data.get("content"):
-            post_text_parts.append(f"Content: {post_data['content']}")
-        
-        if post_data.get("tags"):
-            post_text_parts.append(f"Tags: {', '.join(post_data['tags'])}")
-        
-        post_text = "\n".join(post_text_parts)
+        digest = text_digest(post_text)
+        embedding_id = stored_embedding_id("post", post_id, digest)
+        if embedding_id:
+            logger.info("Post embedding unchanged", post_id=post_id)
+            return {
+                "status": "cached",
+                "post_id": post_id,
+                "embedding_id": embedding_id,
+                "text_length": len(post_text)
+            }
         
         current_task.update_state(state="PROGRESS", meta={"progress": 70})
         
-        # Generate embedding (simulated for now)
-        import time
-        time.sleep(0.5)
+        embedding_id = run_async(_store_embedding("post", post_id, post_text))
         
         current_task.update_state(state="PROGRESS", meta={"progress": 100})
         
         result = {
             "status": "completed",
             "post_id": post_id,
-            "embedding_id": "embedding_789",
+            "embedding_id": embedding_id,
             "text_length": len(post_text)
         }
+        remember_embedding_source("post", post_id, digest, embedding_id)
         
         logger.info("Post embedding generated", post_id=post_id, result=result)
         return result
@@ -185,54 +377,127 @@ def generate_post_embedding(self, post_id: str, post_data: Dict[str, Any]):
 
 
 @celery_app.task(bind=True)
-def bulk_regenerate_embeddings(self, entity_type: str, entity_ids: List[str]):
+def bulk_regenerate_embeddings(self, entity_type: str, entity_ids: List[str], force: bool = False):
     """
     Regenerate embeddings for multiple entities
+    
+    Dispatches a chord of regenerate_embeddings_shard subtasks, one per 500
+    IDs, so the whole worker pool shares the work; the chord's callback
+    combines their results. Entities whose text is unchanged since their
+    embedding was stored are skipped unless force is set.
     """
     try:
         total_entities = len(entity_ids)
-        current_task.update_state(state="PROGRESS", meta={"progress": 0, "total": total_entities})
         
         logger.info("Starting bulk embedding regeneration", 
                    entity_type=entity_type, count=total_entities)
         
-        processed_entities = []
-        failed_entities = []
+        if entity_type not in _ENTITY_SOURCES:
+            raise ValidationError(f"Unknown entity type: {entity_type}")
         
-        for i, entity_id in enumerate(entity_ids):
-            try:
-                # TODO: Implement actual embedding regeneration
-                # This would load the entity data and regenerate embeddings
-                
-                processed_entities.append(entity_id)
-                
-                # Update progress
-                progress = int((i + 1) / total_entities * 100)
+        # Waiting on subtasks inside a task can deadlock, so return the chord's
+        # result ID; the aggregated result is available from it
+        job = chord(
+            group(
+                regenerate_embeddings_shard.s(entity_type, list(shard), force)
+                for shard in itertools.batched(entity_ids, _REGENERATE_SHARD_SIZE)
+            )
+        )(aggregate_regenerated_embeddings.s(entity_type, total_entities))
+        
+        result = {
+            "status": "dispatched",
+            "entity_type": entity_type,
+            "total_entities": total_entities,
+            "shards": -(-total_entities // _REGENERATE_SHARD_SIZE),
+            "result_id": job.id
+        }
+        
+        logger.info("Bulk embedding regeneration dispatched", result=result)
+        return result
+        
+    except Exception as e:
+        logger.error("Bulk embedding regeneration failed", 
+                    entity_type=entity_type, error=str(e))
+        current_task.update_state(
+            state="FAILURE",
+            meta={"error": str(e)}
+        )
+        raise
+
+
+@celery_app.task(bind=True)
+def regenerate_embeddings_shard(self, entity_type: str, entity_ids: List[str], force: bool = False):
+    """
+    Regenerate embeddings for one shard of a bulk regeneration
+    
+    The shard's chunks run concurrently, up to VECTOR_MAX_CONCURRENCY at a
+    time, so their embedding requests overlap instead of queueing.
+    """
+    try:
+        total_entities = len(entity_ids)
+        current_task.update_state(state="PROGRESS", meta={"progress": 0, "total": total_entities})
+        
+        last_report_at = time.monotonic()
+        last_report_progress = 0
+        
+        def report(done: int) -> None:
+            # Each report is a result backend write: only send one when the
+            # percentage moved and the last is at least _PROGRESS_INTERVAL old
+            nonlocal last_report_at, last_report_progress
+            progress = int(done / total_entities * 100)
+            now = time.monotonic()
+            if progress > last_report_progress and (now - last_report_at >= _PROGRESS_INTERVAL or done == total_entities):
                 current_task.update_state(
                     state="PROGRESS",
                     meta={
                         "progress": progress,
-                        "processed": i + 1,
+                        "processed": done,
                         "total": total_entities
                     }
                 )
-                
-                # Small delay to avoid overwhelming the system
-                import time
-                time.sleep(0.2)
-                
-            except Exception as entity_error:
-                logger.warning("Failed to regenerate embedding for entity", 
-                             entity_type=entity_type, entity_id=entity_id, 
-                             error=str(entity_error))
-                failed_entities.append(entity_id)
-                continue
+                last_report_at = now
+                last_report_progress = progress
+        
+        processed_entities, failed_entities, unchanged_count = run_async(
+            _regenerate_shard(entity_type, entity_ids, force, report)
+        )
+        
+        result = {
+            "processed_entities": processed_entities,
+            "failed_entities": failed_entities,
+            "unchanged_entities": unchanged_count
+        }
+        
+        logger.info("Embedding regeneration shard completed", 
+                   entity_type=entity_type, processed=len(processed_entities), 
+                   failed=len(failed_entities))
+        return result
+        
+    except Exception as e:
+        logger.error("Embedding regeneration shard failed", 
+                    entity_type=entity_type, count=len(entity_ids), error=str(e))
+        current_task.update_state(
+            state="FAILURE",
+            meta={"error": str(e)}
+        )
+        raise
+
+
+@celery_app.task(bind=True)
+def aggregate_regenerated_embeddings(self, shard_results: List[Dict[str, Any]], entity_type: str, total_entities: int):
+    """
+    Combine the shard results of a bulk regeneration
+    """
+    try:
+        processed_entities = [entity_id for shard in shard_results for entity_id in shard["processed_entities"]]
+        failed_entities = [entity_id for shard in shard_results for entity_id in shard["failed_entities"]]
         
         result = {
             "status": "completed",
             "entity_type": entity_type,
             "total_entities": total_entities,
             "successful_regenerations": len(processed_entities),
+            "unchanged_entities": sum(shard["unchanged_entities"] for shard in shard_results),
             "failed_regenerations": len(failed_entities),
             "processed_entities": processed_entities,
             "failed_entities": failed_entities
@@ -242,7 +507,7 @@ def bulk_regenerate_embeddings(self, entity_type: str, entity_ids: List[str]):
         return result
         
     except Exception as e:
-        logger.error("Bulk embedding regeneration failed", 
+        logger.error("Bulk embedding regeneration aggregation failed", 
                     entity_type=entity_type, error=str(e))
         current_task.update_state(
             state="FAILURE",
@@ -259,20 +524,13 @@ def cleanup_orphaned_embeddings(self):
     try:
         logger.info("Starting orphaned embeddings cleanup")
         
-        # TODO: Implement cleanup logic
-        # This would involve:
-        # 1. Finding embeddings with non-existent entities
-        # 2. Removing them from both database and Pinecone
-        
-        # Simulate cleanup
-        import time
-        time.sleep(2)
+        cleaned = run_async(_delete_orphaned_embeddings())
         
         result = {
             "status": "completed",
-            "orphaned_embeddings_found": 25,
-            "embeddings_cleaned": 25,
-            "pinecone_vectors_deleted": 25
+            "orphaned_embeddings_found": cleaned,
+            "embeddings_cleaned": cleaned,
+            "pinecone_vectors_deleted": cleaned
         }
         
         logger.info("Orphaned embeddings cleanup completed", result=result)
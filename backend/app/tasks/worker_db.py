@@ -0,0 +1,133 @@
+"""
+Per-process database and vector service connections for Celery workers
+"""
+
+from typing import Any, Coroutine, Optional, TypeVar
+import asyncio
+import threading
+
+import asyncpg
+import structlog
+from celery.signals import worker_process_init, worker_process_shutdown
+from pgvector.asyncpg import register_vector
+
+from app.core.config import get_settings
+from app.core.database import database_manager
+from app.services.vector_service import close_vector_service, get_vector_service
+
+logger = structlog.get_logger(__name__)
+
+T = TypeVar("T")
+
+_POOL_MIN_SIZE = 5
+_POOL_MAX_SIZE = 20
+
+# The pool's connections belong to one event loop, so each worker process
+# runs a single loop in a background thread for its lifetime and task bodies
+# submit their coroutines to it; tasks skip the connect handshake and reuse
+# server-side prepared statements. Writes that go through the services use
+# database_manager's pooled engine, connected on the same loop. Prefork
+# children open everything in worker_process_init; the solo and threads pools
+# and eager tasks never send that signal, so the first run_async opens it
+_lock = threading.Lock()
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_thread: Optional[threading.Thread] = None
+_pool: Optional[asyncpg.Pool] = None
+
+
+def _asyncpg_dsn(database_url: str) -> str:
+    """Strip the SQLAlchemy driver suffix from a postgresql+asyncpg:// URL"""
+    return database_url.replace("postgresql+asyncpg://", "postgresql://", 1)
+
+
+async def _warm_vector_service() -> None:
+    """Build the vector index, Redis and OpenAI clients before the first task needs them"""
+    get_vector_service().openai_client
+
+
+async def _open_connections() -> None:
+    global _pool
+    _pool = await asyncpg.create_pool(
+        _asyncpg_dsn(get_settings().database_url),
+        min_size=_POOL_MIN_SIZE,
+        max_size=_POOL_MAX_SIZE,
+        init=register_vector
+    )
+    await database_manager.connect()
+    await _warm_vector_service()
+
+
+async def _close_connections() -> None:
+    global _pool
+    await close_vector_service()
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
+    await database_manager.disconnect()
+
+
+def _stop_loop(loop: asyncio.AbstractEventLoop, thread: threading.Thread) -> None:
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+
+def _ensure_open() -> asyncio.AbstractEventLoop:
+    """Start the process's event loop thread and open its connections, once"""
+    global _loop, _loop_thread, _pool
+    with _lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="worker-db-loop", daemon=True)
+            thread.start()
+            try:
+                asyncio.run_coroutine_threadsafe(_open_connections(), loop).result()
+            except BaseException:
+                _stop_loop(loop, thread)
+                _pool = None
+                raise
+            _loop, _loop_thread = loop, thread
+            logger.info("Worker database pool opened", min_size=_POOL_MIN_SIZE, max_size=_POOL_MAX_SIZE)
+        return _loop
+
+
+# Connected after vector_service's own worker_process_init handler (imported
+# above), so warming starts from the clients the child rebuilt
+@worker_process_init.connect
+def _open_pool(**kwargs) -> None:
+    """Open the process's event loop, connection pool and vector clients after the fork"""
+    global _lock, _loop, _loop_thread, _pool
+    # Nothing opened in the parent survives the fork (its loop thread is gone)
+    _lock = threading.Lock()
+    _loop = _loop_thread = _pool = None
+    _ensure_open()
+
+
+@worker_process_shutdown.connect
+def _close_pool(**kwargs) -> None:
+    global _loop, _loop_thread
+    with _lock:
+        if _loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(_close_connections(), _loop).result()
+        _stop_loop(_loop, _loop_thread)
+        _loop = _loop_thread = None
+
+
+def run_async(coro: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine from a task body on the worker's event loop, opening it on first use"""
+    future = asyncio.run_coroutine_threadsafe(coro, _ensure_open())
+    try:
+        return future.result()
+    except BaseException:
+        # e.g. a soft time limit raised in the task thread; stop the coroutine too
+        future.cancel()
+        raise
+
+
+def get_pool() -> asyncpg.Pool:
+    """Get the worker's connection pool; only valid inside coroutines given to run_async"""
+    if _pool is None:
+        raise RuntimeError("Worker database pool not initialized")
+    return _pool
+
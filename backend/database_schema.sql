@@ -1,15 +1,50 @@
 -- Digital Twin Social Media Platform Database Schema
 -- Compatible with Supabase and PostgreSQL
 
--- Enable UUID extension
-CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
-
 -- Enable vector extension for embeddings (Supabase pgvector)
 CREATE EXTENSION IF NOT EXISTS vector;
 
+-- Time-ordered UUIDv7 primary keys: new rows land on the right-most B-tree
+-- leaf instead of a random page, keeping index inserts cache-friendly.
+-- Starts from a random v4 UUID (same variant bits), overlays the 48-bit
+-- millisecond timestamp and flips the version nibble from 4 to 7.
+CREATE OR REPLACE FUNCTION uuid_generate_v7()
+RETURNS UUID AS $$
+BEGIN
+    RETURN encode(
+        set_bit(
+            set_bit(
+                overlay(
+                    uuid_send(gen_random_uuid())
+                    PLACING substring(int8send(floor(extract(epoch FROM clock_timestamp()) * 1000)::bigint) FROM 3)
+                    FROM 1 FOR 6
+                ),
+                52, 1
+            ),
+            53, 1
+        ),
+        'hex'
+    )::uuid;
+END;
+$$ LANGUAGE plpgsql VOLATILE;
+
+-- Smallest UUIDv7 for a timestamp: its 48-bit millisecond prefix followed by
+-- zeros. Used as range-partition bounds, since v7 ids sort by creation time.
+CREATE OR REPLACE FUNCTION uuid_v7_lower_bound(ts TIMESTAMP WITH TIME ZONE)
+RETURNS UUID AS $$
+    SELECT encode(
+        overlay(
+            '\x00000000000000000000000000000000'::bytea
+            PLACING substring(int8send(floor(extract(epoch FROM ts) * 1000)::bigint) FROM 3)
+            FROM 1 FOR 6
+        ),
+        'hex'
+    )::uuid;
+$$ LANGUAGE sql IMMUTABLE;
+
 -- Users table
 CREATE TABLE users (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v7(),
     email VARCHAR(255) UNIQUE NOT NULL,
     google_id VARCHAR(255) UNIQUE NOT NULL,
     full_name VARCHAR(255) NOT NULL,
@@ -27,7 +62,7 @@ CREATE TABLE users (
 
 -- Digital Twin Agents table
 CREATE TABLE agents (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v7(),
     user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
     name VARCHAR(255) NOT NULL,
     personality_type VARCHAR(100), -- e.g., "professional", "casual", "technical"
@@ -45,19 +80,24 @@ CREATE TABLE agents (
 
 -- Resume data storage
 CREATE TABLE resumes (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v7(),
     user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
     file_url VARCHAR(500) NOT NULL,
     file_name VARCHAR(255) NOT NULL,
-    parsed_data JSONB NOT NULL, -- Structured resume data from parser
-    raw_text TEXT,
     is_current BOOLEAN DEFAULT true,
     uploaded_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
+-- Resume bodies, kept off the resumes row so metadata listings stay narrow
+CREATE TABLE resume_contents (
+    resume_id UUID PRIMARY KEY REFERENCES resumes(id) ON DELETE CASCADE,
+    parsed_data JSONB NOT NULL, -- Structured resume data from parser
+    raw_text TEXT
+);
+
 -- Conversations table
 CREATE TABLE conversations (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v7(),
     type VARCHAR(50) NOT NULL CHECK (type IN ('agent_to_agent', 'user_to_user', 'user_to_agent')),
     initiator_user_id UUID REFERENCES users(id) ON DELETE SET NULL,
     target_user_id UUID REFERENCES users(id) ON DELETE SET NULL,
@@ -72,7 +112,7 @@ CREATE TABLE conversations (
 
 -- Messages table
 CREATE TABLE messages (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v7(),
     conversation_id UUID NOT NULL REFERENCES conversations(id) ON DELETE CASCADE,
     sender_type VARCHAR(20) NOT NULL CHECK (sender_type IN ('user', 'agent')),
     sender_user_id UUID REFERENCES users(id) ON DELETE SET NULL,
@@ -87,35 +127,36 @@ CREATE TABLE messages (
 
 -- Posts table (Social feed)
 CREATE TABLE posts (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v7(),
     user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
     title VARCHAR(500) NOT NULL,
     content TEXT NOT NULL,
     post_type VARCHAR(50) DEFAULT 'text' CHECK (post_type IN ('text', 'link', 'image', 'poll')),
     tags TEXT[],
-    metadata JSONB DEFAULT '{}', -- For links, images, poll options
+    metadata JSONB NOT NULL DEFAULT '{}'::jsonb, -- For links, images, poll options
     upvotes INT DEFAULT 0,
     downvotes INT DEFAULT 0,
     comment_count INT DEFAULT 0,
+    score INT GENERATED ALWAYS AS (upvotes - downvotes) STORED, -- Feed ranking
     is_pinned BOOLEAN DEFAULT false,
     is_archived BOOLEAN DEFAULT false,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
-);
+) PARTITION BY RANGE (id);
 
 -- Post votes table
 CREATE TABLE post_votes (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v7(),
     post_id UUID NOT NULL REFERENCES posts(id) ON DELETE CASCADE,
     user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
-    vote_type VARCHAR(10) NOT NULL CHECK (vote_type IN ('up', 'down')),
+    vote_type SMALLINT NOT NULL CHECK (vote_type IN (-1, 1)),
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
     UNIQUE(post_id, user_id)
 );
 
 -- Comments table
 CREATE TABLE comments (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v7(),
     post_id UUID NOT NULL REFERENCES posts(id) ON DELETE CASCADE,
     user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
     parent_comment_id UUID REFERENCES comments(id) ON DELETE SET NULL,
@@ -125,21 +166,56 @@ CREATE TABLE comments (
     is_edited BOOLEAN DEFAULT false,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+) PARTITION BY RANGE (id);
+
+-- Monthly partitions for the feed tables. They are keyed on the time-ordered
+-- id rather than created_at so the primary key (and the foreign keys pointing
+-- at it) stay on id alone; inserts only touch the current month's indexes.
+CREATE OR REPLACE FUNCTION create_feed_partitions(month_start TIMESTAMP WITH TIME ZONE)
+RETURNS VOID AS $$
+DECLARE
+    parent TEXT;
+    range_start TIMESTAMP WITH TIME ZONE := date_trunc('month', month_start, 'UTC');
+    range_end TIMESTAMP WITH TIME ZONE := date_trunc('month', month_start, 'UTC') + INTERVAL '1 month';
+BEGIN
+    FOREACH parent IN ARRAY ARRAY['posts', 'comments'] LOOP
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+            parent || '_' || to_char(range_start AT TIME ZONE 'UTC', 'YYYY_MM'),
+            parent,
+            uuid_v7_lower_bound(range_start),
+            uuid_v7_lower_bound(range_end)
+        );
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TABLE posts_default PARTITION OF posts DEFAULT;
+CREATE TABLE comments_default PARTITION OF comments DEFAULT;
+SELECT create_feed_partitions(NOW());
+SELECT create_feed_partitions(NOW() + INTERVAL '1 month');
+
+-- Pre-create next month's partitions ahead of time (pg_cron ships with Supabase)
+CREATE EXTENSION IF NOT EXISTS pg_cron;
+SELECT cron.schedule(
+    'create-feed-partitions',
+    '0 0 25 * *',
+    $$SELECT create_feed_partitions(NOW() + INTERVAL '1 month')$$
 );
 
 -- Comment votes table
 CREATE TABLE comment_votes (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v7(),
     comment_id UUID NOT NULL REFERENCES comments(id) ON DELETE CASCADE,
     user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
-    vote_type VARCHAR(10) NOT NULL CHECK (vote_type IN ('up', 'down')),
+    vote_type SMALLINT NOT NULL CHECK (vote_type IN (-1, 1)),
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
     UNIQUE(comment_id, user_id)
 );
 
 -- Matches table (Agent-driven user matching)
 CREATE TABLE matches (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v7(),
     user1_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
     user2_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
     agent1_id UUID NOT NULL REFERENCES agents(id) ON DELETE CASCADE,
@@ -159,7 +235,7 @@ CREATE TABLE matches (
 
 -- Notifications table
 CREATE TABLE notifications (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v7(),
     user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
     type VARCHAR(100) NOT NULL, -- 'match_found', 'message_received', 'post_comment', etc.
     title VARCHAR(255) NOT NULL,
@@ -171,7 +247,7 @@ CREATE TABLE notifications (
 
 -- Embeddings table (for vector similarity search)
 CREATE TABLE embeddings (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v7(),
     entity_type VARCHAR(50) NOT NULL, -- 'user_profile', 'resume', 'post', 'agent'
     entity_id UUID NOT NULL,
     embedding vector(1536), -- OpenAI ada-002 embedding dimension
@@ -181,7 +257,7 @@ CREATE TABLE embeddings (
 
 -- Background jobs table (for Celery task tracking)
 CREATE TABLE background_jobs (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v7(),
     task_id VARCHAR(255) UNIQUE NOT NULL,
     task_name VARCHAR(255) NOT NULL,
     user_id UUID REFERENCES users(id) ON DELETE SET NULL,
@@ -200,15 +276,22 @@ CREATE TABLE background_jobs (
 CREATE INDEX idx_users_email ON users(email);
 CREATE INDEX idx_users_google_id ON users(google_id);
 CREATE INDEX idx_agents_user_id ON agents(user_id);
+CREATE INDEX idx_agents_user_active ON agents(user_id) WHERE is_active = true;
+CREATE INDEX idx_resumes_user_current ON resumes(user_id) WHERE is_current = true;
+CREATE INDEX idx_resume_contents_parsed_data ON resume_contents USING GIN(parsed_data jsonb_path_ops);
 CREATE INDEX idx_conversations_users ON conversations(initiator_user_id, target_user_id);
 CREATE INDEX idx_messages_conversation ON messages(conversation_id, created_at);
-CREATE INDEX idx_posts_created_at ON posts(created_at DESC);
+CREATE INDEX idx_posts_created_at_id ON posts(created_at DESC, id DESC);
+CREATE INDEX idx_posts_user_created ON posts(user_id, created_at);
 CREATE INDEX idx_posts_tags ON posts USING GIN(tags);
+CREATE INDEX idx_posts_score_created ON posts(score DESC, created_at DESC) WHERE NOT is_archived;
+CREATE INDEX idx_post_votes_user ON post_votes(user_id) INCLUDE (post_id, vote_type);
 CREATE INDEX idx_comments_post_id ON comments(post_id, created_at);
+CREATE INDEX idx_comment_votes_user ON comment_votes(user_id) INCLUDE (comment_id, vote_type);
 CREATE INDEX idx_matches_users ON matches(user1_id, user2_id);
 CREATE INDEX idx_matches_status ON matches(status, created_at);
 CREATE INDEX idx_notifications_user ON notifications(user_id, is_read, created_at);
-CREATE INDEX idx_embeddings_entity ON embeddings(entity_type, entity_id);
+CREATE UNIQUE INDEX idx_embeddings_entity ON embeddings(entity_type, entity_id);
 CREATE INDEX idx_embeddings_vector ON embeddings USING ivfflat (embedding vector_cosine_ops) WITH (lists = 100);
 CREATE INDEX idx_background_jobs_status ON background_jobs(status, created_at);
 
@@ -227,20 +310,42 @@ CREATE TRIGGER update_messages_updated_at BEFORE UPDATE ON messages FOR EACH ROW
 CREATE TRIGGER update_posts_updated_at BEFORE UPDATE ON posts FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 CREATE TRIGGER update_comments_updated_at BEFORE UPDATE ON comments FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 
+-- Publish changed users/agents so every API process drops its cached copy,
+-- including writes that do not go through the API (Supabase, ad-hoc SQL).
+-- pg_notify is transactional: listeners only hear about committed changes.
+CREATE OR REPLACE FUNCTION notify_cache_invalidation()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM pg_notify('cache_invalidation', json_build_object(
+        'table', TG_TABLE_NAME,
+        'id', OLD.id,
+        'google_id', to_jsonb(OLD)->>'google_id'
+    )::text);
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+CREATE TRIGGER notify_users_cache_invalidation AFTER UPDATE OR DELETE ON users FOR EACH ROW EXECUTE FUNCTION notify_cache_invalidation();
+-- Counter columns are left out; AgentService.increment_conversation_count evicts the cached agent itself
+CREATE TRIGGER notify_agents_cache_invalidation
+    AFTER UPDATE OF user_id, name, personality_type, persona_description, conversation_style,
+        background_context, goals, interests, is_active OR DELETE ON agents
+    FOR EACH ROW EXECUTE FUNCTION notify_cache_invalidation();
+
 -- Functions for vote counting
 CREATE OR REPLACE FUNCTION update_post_vote_counts()
 RETURNS TRIGGER AS $$
 BEGIN
     IF TG_OP = 'INSERT' OR TG_OP = 'UPDATE' THEN
         UPDATE posts SET 
-            upvotes = (SELECT COUNT(*) FROM post_votes WHERE post_id = NEW.post_id AND vote_type = 'up'),
-            downvotes = (SELECT COUNT(*) FROM post_votes WHERE post_id = NEW.post_id AND vote_type = 'down')
+            upvotes = (SELECT COUNT(*) FROM post_votes WHERE post_id = NEW.post_id AND vote_type = 1),
+            downvotes = (SELECT COUNT(*) FROM post_votes WHERE post_id = NEW.post_id AND vote_type = -1)
         WHERE id = NEW.post_id;
         RETURN NEW;
     ELSIF TG_OP = 'DELETE' THEN
         UPDATE posts SET 
-            upvotes = (SELECT COUNT(*) FROM post_votes WHERE post_id = OLD.post_id AND vote_type = 'up'),
-            downvotes = (SELECT COUNT(*) FROM post_votes WHERE post_id = OLD.post_id AND vote_type = 'down')
+            upvotes = (SELECT COUNT(*) FROM post_votes WHERE post_id = OLD.post_id AND vote_type = 1),
+            downvotes = (SELECT COUNT(*) FROM post_votes WHERE post_id = OLD.post_id AND vote_type = -1)
         WHERE id = OLD.post_id;
         RETURN OLD;
     END IF;
@@ -275,6 +380,7 @@ CREATE TRIGGER trigger_update_post_comment_counts
 ALTER TABLE users ENABLE ROW LEVEL SECURITY;
 ALTER TABLE agents ENABLE ROW LEVEL SECURITY;
 ALTER TABLE resumes ENABLE ROW LEVEL SECURITY;
+ALTER TABLE resume_contents ENABLE ROW LEVEL SECURITY;
 ALTER TABLE conversations ENABLE ROW LEVEL SECURITY;
 ALTER TABLE messages ENABLE ROW LEVEL SECURITY;
 ALTER TABLE posts ENABLE ROW LEVEL SECURITY;
@@ -291,6 +397,9 @@ CREATE POLICY "Users can manage own agents" ON agents FOR ALL USING (auth.uid():
 
 -- Resumes can only be accessed by their owners
 CREATE POLICY "Users can manage own resumes" ON resumes FOR ALL USING (auth.uid()::text = user_id::text);
+CREATE POLICY "Users can manage own resume contents" ON resume_contents FOR ALL USING (
+    EXISTS (SELECT 1 FROM resumes WHERE resumes.id = resume_id AND auth.uid()::text = resumes.user_id::text)
+);
 
 -- Posts are publicly readable but only editable by owners
 CREATE POLICY "Posts are publicly readable" ON posts FOR SELECT USING (true);
@@ -2,37 +2,84 @@
 Digital Twin Social Media Platform - FastAPI Main Application
 """
 
+import asyncio
 import os
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, Dict
 
+import orjson
 import structlog
-from fastapi import FastAPI, Request
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.middleware.gzip import GzipMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from slowapi.util import get_remote_address
+from starlette.types import ASGIApp, Receive, Scope, Send
+from zstd_asgi import ZstdMiddleware
 
+from app.core.cache import listen_for_invalidations
 from app.core.config import get_settings
 from app.core.database import database_manager
 from app.core.exceptions import setup_exception_handlers
+from app.core.redis import redis_manager
+from app.core.security import RateLimiter
 from app.core.logging import setup_logging
 from app.api.v1.api import api_router
 
+# Resolved once at import; lifespan, the app factory and __main__ share it
+settings = get_settings()
+
 # Setup structured logging
 logger = structlog.get_logger(__name__)
 
 # Rate limiter setup
 limiter = Limiter(key_func=get_remote_address)
 
+# Fixed bodies for the probe endpoints, answered ahead of the middleware stack
+STATIC_RESPONSES = {
+    "/health": {"status": "healthy", "service": "digital-twin-api"},
+    "/": {
+        "message": "Digital Twin Social Media Platform API",
+        "version": "1.0.0",
+        "docs": "/docs",
+    },
+}
+
+
+class StaticResponseMiddleware:
+    """
+    Answer GET/HEAD requests for fixed JSON endpoints without entering the app
+    
+    Liveness probes hit these constantly; serving pre-encoded bytes skips
+    CORS, compression, routing and dependency resolution entirely.
+    """
+    
+    def __init__(self, app: ASGIApp, responses: Dict[str, Any]):
+        self.app = app
+        self.responses = {}
+        for path, content in responses.items():
+            body = orjson.dumps(content)
+            headers = [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+            ]
+            self.responses[path] = (headers, body)
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        response = self.responses.get(scope["path"]) if scope["type"] == "http" else None
+        if response is None or scope["method"] not in ("GET", "HEAD"):
+            await self.app(scope, receive, send)
+            return
+        
+        headers, body = response
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": body if scope["method"] == "GET" else b""})
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Application lifespan manager"""
-    settings = get_settings()
-    
     logger.info("Starting Digital Twin Social Media Platform API")
     
     try:
@@ -40,10 +87,18 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         await database_manager.connect()
         logger.info("Database connected successfully")
         
-        # Initialize Redis connection (if needed)
-        # await redis_manager.connect()
+        # Initialize Redis connection (rate limiting, caching)
+        await redis_manager.connect()
         
-        yield
+        invalidation_listener = asyncio.create_task(
+            listen_for_invalidations(database_manager.engine)
+        )
+        try:
+            yield
+        finally:
+            # Let the listener unwind before the engine and Redis go away below
+            invalidation_listener.cancel()
+            await asyncio.gather(invalidation_listener, return_exceptions=True)
         
     except Exception as e:
         logger.error("Failed to start application", error=str(e))
@@ -52,12 +107,11 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         # Cleanup connections
         await database_manager.disconnect()
         logger.info("Database disconnected")
+        await redis_manager.disconnect()
 
 
 def create_application() -> FastAPI:
     """Create and configure FastAPI application"""
-    settings = get_settings()
-    
     # Setup logging first
     setup_logging(settings.log_level)
     
@@ -68,14 +122,15 @@ def create_application() -> FastAPI:
         docs_url="/docs" if settings.debug else None,
         redoc_url="/redoc" if settings.debug else None,
         lifespan=lifespan,
+        default_response_class=ORJSONResponse,
     )
     
     # Setup rate limiting
     app.state.limiter = limiter
     app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
     
-    # Add middleware
-    app.add_middleware(GzipMiddleware, minimum_size=1000)
+    # Add middleware: zstd for clients that accept it, gzip for the rest
+    app.add_middleware(ZstdMiddleware, minimum_size=1000, level=3, gzip_fallback=True)
     
     # CORS middleware
     app.add_middleware(
@@ -89,22 +144,15 @@ def create_application() -> FastAPI:
     # Setup exception handlers
     setup_exception_handlers(app)
     
-    # Include API routes
-    app.include_router(api_router, prefix="/api/v1")
-    
-    @app.get("/health")
-    async def health_check():
-        """Health check endpoint"""
-        return {"status": "healthy", "service": "digital-twin-api"}
+    # Include API routes, each limited per client and path
+    app.include_router(
+        api_router,
+        prefix="/api/v1",
+        dependencies=[Depends(RateLimiter(settings.rate_limit_requests, settings.rate_limit_period))]
+    )
     
-    @app.get("/")
-    async def root():
-        """Root endpoint"""
-        return {
-            "message": "Digital Twin Social Media Platform API",
-            "version": "1.0.0",
-            "docs": "/docs",
-        }
+    # Added last so it runs first: health checks and the root endpoint
+    app.add_middleware(StaticResponseMiddleware, responses=STATIC_RESPONSES)
     
     return app
 
@@ -115,8 +163,6 @@ app = create_application()
 if __name__ == "__main__":
     import uvicorn
     
-    settings = get_settings()
-    
     uvicorn.run(
         "main:app",
         host=settings.host,
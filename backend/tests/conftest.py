@@ -3,20 +3,71 @@ Test configuration and fixtures
 """
 
 import asyncio
+import os
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
 import pytest
 import pytest_asyncio
-from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from asgi_lifespan import LifespanManager
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
-from app.main import app
+# Settings without defaults; placeholders so main imports without a .env
+for _name in (
+    "DATABASE_URL", "SUPABASE_URL", "SUPABASE_KEY", "GOOGLE_CLIENT_ID", "GOOGLE_CLIENT_SECRET",
+    "OPENAI_API_KEY", "PINECONE_API_KEY", "PINECONE_ENVIRONMENT",
+):
+    os.environ.setdefault(_name, "test")
+# Long enough that PyJWT doesn't warn about a short HMAC key
+os.environ.setdefault("SECRET_KEY", "test-secret-key-for-signing-jwts-in-tests")
+
+from main import app as fastapi_app
 from app.core.database import get_db, Base
 from app.core.config import get_settings
+from app.core.security import UserClaims, get_current_active_user
+from app.models import load_all
+from app.models.agent import Agent
+
+# Test database URL (in-memory SQLite; StaticPool keeps the one connection alive)
+TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
+
+
+# Column values every agent mock starts from; tests override what they assert on
+_AGENT_MOCK_DEFAULTS = {
+    "name": "Test Agent",
+    "personality_type": "professional",
+    "persona_description": "A test agent",
+    "conversation_style": {"tone": "friendly"},
+    "background_context": "Test background",
+    "goals": ["networking"],
+    "interests": ["technology"],
+    "is_active": True,
+    "last_conversation_at": None,
+    "total_conversations": 0,
+    "created_at": datetime(2024, 1, 1, tzinfo=timezone.utc),
+    "updated_at": datetime(2024, 1, 1, tzinfo=timezone.utc),
+}
+
+
+def _configure_sqlite_connection(dbapi_connection, connection_record) -> None:
+    """Per-connection SQLite setup; durability is skipped since the database is thrown away"""
+    # Let SQLAlchemy emit BEGIN itself so SAVEPOINTs and rollbacks behave
+    dbapi_connection.isolation_level = None
+    # Stands in for the Postgres function behind the models' primary key default
+    dbapi_connection.create_function("uuid_generate_v7", 0, lambda: uuid.uuid4().hex)
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=MEMORY")
+    cursor.execute("PRAGMA synchronous=OFF")
+    cursor.close()
+
 
-# Test database URL (using SQLite for tests)
-TEST_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
+def _begin_sqlite_transaction(conn) -> None:
+    conn.exec_driver_sql("BEGIN")
 
 
 @pytest.fixture(scope="session")
@@ -27,45 +78,88 @@ def event_loop():
     loop.close()
 
 
-@pytest_asyncio.fixture
-async def test_db():
-    """Create test database session"""
+@pytest_asyncio.fixture(scope="session")
+async def _engine():
+    """Engine with the schema created once for the whole session"""
     engine = create_async_engine(
         TEST_DATABASE_URL,
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
     )
+    event.listen(engine.sync_engine, "connect", _configure_sqlite_connection)
+    event.listen(engine.sync_engine, "begin", _begin_sqlite_transaction)
     
+    load_all()
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
     
-    async_session = sessionmaker(
-        engine, class_=AsyncSession, expire_on_commit=False
-    )
+    yield engine
     
-    async with async_session() as session:
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def test_db(_engine):
+    """Test database session whose writes are rolled back after each test"""
+    async with _engine.connect() as conn:
+        transaction = await conn.begin()
+        # Commits inside the code under test only release a savepoint
+        session = AsyncSession(
+            bind=conn, expire_on_commit=False, join_transaction_mode="create_savepoint"
+        )
+        
         yield session
+        
+        await session.close()
+        await transaction.rollback()
+
+
+@asynccontextmanager
+async def _test_lifespan(app):
+    """
+    Stands in for the real lifespan: no database, Redis or LISTEN connections
     
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.drop_all)
-    
-    await engine.dispose()
+    Sessions come from the get_db override; with no Redis client the cache is
+    bypassed and rate limiting lets every request through.
+    """
+    yield
 
 
-@pytest.fixture
-def client(test_db):
-    """Create test client with database override"""
+@pytest_asyncio.fixture(scope="session")
+async def app():
+    """Application whose (test) lifespan runs once for the session"""
+    lifespan = fastapi_app.router.lifespan_context
+    fastapi_app.router.lifespan_context = _test_lifespan
+    try:
+        async with LifespanManager(fastapi_app):
+            yield fastapi_app
+    finally:
+        fastapi_app.router.lifespan_context = lifespan
+
+
+@pytest_asyncio.fixture
+async def client(app, test_db):
+    """Create async test client with database override"""
     def override_get_db():
         return test_db
     
     app.dependency_overrides[get_db] = override_get_db
     
-    with TestClient(app) as client:
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
         yield client
     
     app.dependency_overrides.clear()
 
 
+@pytest.fixture
+def authenticate(app):
+    """Make requests authenticate as the given claims, without a JWT"""
+    def override(claims: UserClaims) -> None:
+        app.dependency_overrides[get_current_active_user] = lambda: claims
+    
+    return override
+
+
 @pytest.fixture
 def mock_settings():
     """Mock settings for testing"""
@@ -92,4 +186,16 @@ def sample_agent_data():
         "persona_description": "A friendly professional agent",
         "goals": ["networking", "learning"],
         "interests": ["technology", "innovation"]
-    }
\ No newline at end of file
+    }
+
+
+@pytest.fixture
+def agent_mock_factory():
+    """Build Agent mocks from the shared defaults plus per-test overrides"""
+    def make(**overrides) -> MagicMock:
+        agent = MagicMock(spec=Agent)
+        for field, value in {**_AGENT_MOCK_DEFAULTS, **overrides}.items():
+            setattr(agent, field, value)
+        return agent
+    
+    return make
\ No newline at end of file
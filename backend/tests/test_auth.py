@@ -2,28 +2,37 @@
 Tests for authentication endpoints
 """
 
+import uuid
+
 import pytest
 from unittest.mock import patch, MagicMock
 
+from app.core.security import UserClaims
+
+# Every test drives the app through the async client
+pytestmark = pytest.mark.asyncio
+
+USER_ID = uuid.UUID("0190a1b2-c3d4-7e5f-8a9b-0c1d2e3f4a5b")
+
 
 class TestAuthEndpoints:
     """Test authentication endpoints"""
     
-    def test_health_check(self, client):
+    async def test_health_check(self, client):
         """Test health check endpoint"""
-        response = client.get("/health")
+        response = await client.get("/health")
         assert response.status_code == 200
         assert response.json()["status"] == "healthy"
     
-    def test_root_endpoint(self, client):
+    async def test_root_endpoint(self, client):
         """Test root endpoint"""
-        response = client.get("/")
+        response = await client.get("/")
         assert response.status_code == 200
         assert "Digital Twin Social Media Platform API" in response.json()["message"]
     
-    @patch('app.core.security.verify_google_token')
+    @patch('app.api.v1.endpoints.auth.verify_google_token')
     @patch('app.services.user_service.UserService.get_or_create_user_from_google')
-    def test_google_auth_success(self, mock_get_user, mock_verify_token, client, sample_user_data):
+    async def test_google_auth_success(self, mock_get_user, mock_verify_token, client, sample_user_data):
         """Test successful Google authentication"""
         # Mock the Google token verification
         mock_verify_token.return_value = {
@@ -35,7 +44,7 @@ class TestAuthEndpoints:
         
         # Mock user creation/retrieval
         mock_user = MagicMock()
-        mock_user.id = "user-123"
+        mock_user.id = USER_ID
         mock_user.email = "test@example.com"
         mock_user.full_name = "Test User"
         mock_user.profile_picture_url = "https://example.com/avatar.jpg"
@@ -44,7 +53,7 @@ class TestAuthEndpoints:
         mock_get_user.return_value = mock_user
         
         # Test the endpoint
-        response = client.post("/api/v1/auth/google", json={
+        response = await client.post("/api/v1/auth/google", json={
             "google_token": "fake-google-token"
         })
         
@@ -54,37 +63,36 @@ class TestAuthEndpoints:
         assert data["token_type"] == "bearer"
         assert "user" in data
     
-    def test_google_auth_invalid_token(self, client):
+    async def test_google_auth_invalid_token(self, client):
         """Test Google authentication with invalid token"""
-        with patch('app.core.security.verify_google_token') as mock_verify:
+        with patch('app.api.v1.endpoints.auth.verify_google_token') as mock_verify:
             mock_verify.side_effect = Exception("Invalid token")
             
-            response = client.post("/api/v1/auth/google", json={
+            response = await client.post("/api/v1/auth/google", json={
                 "google_token": "invalid-token"
             })
             
             assert response.status_code == 401
     
-    def test_google_auth_missing_token(self, client):
+    async def test_google_auth_missing_token(self, client):
         """Test Google authentication with missing token"""
-        response = client.post("/api/v1/auth/google", json={})
+        response = await client.post("/api/v1/auth/google", json={})
         
         assert response.status_code == 422  # Validation error
     
-    @patch('app.core.security.get_current_active_user')
-    def test_get_current_user_info(self, mock_get_user, client):
+    async def test_get_current_user_info(self, client, authenticate):
         """Test getting current user info"""
         # Mock authenticated user
-        mock_get_user.return_value = {
-            "user_id": "user-123",
-            "email": "test@example.com",
-            "name": "Test User"
-        }
+        authenticate(UserClaims(
+            user_id=USER_ID,
+            email="test@example.com",
+            name="Test User"
+        ))
         
         # Mock user service
         with patch('app.services.user_service.UserService.get_user_by_id') as mock_get_by_id:
             mock_user = MagicMock()
-            mock_user.id = "user-123"
+            mock_user.id = USER_ID
             mock_user.email = "test@example.com"
             mock_user.full_name = "Test User"
             mock_user.profile_picture_url = None
@@ -92,29 +100,28 @@ class TestAuthEndpoints:
             
             mock_get_by_id.return_value = mock_user
             
-            response = client.get("/api/v1/auth/me")
+            response = await client.get("/api/v1/auth/me")
             
             assert response.status_code == 200
             data = response.json()
             assert data["email"] == "test@example.com"
             assert data["full_name"] == "Test User"
     
-    def test_get_current_user_info_unauthenticated(self, client):
+    async def test_get_current_user_info_unauthenticated(self, client):
         """Test getting user info without authentication"""
-        response = client.get("/api/v1/auth/me")
+        response = await client.get("/api/v1/auth/me")
         
         assert response.status_code == 403  # No auth header
     
-    @patch('app.core.security.get_current_active_user')
-    def test_logout(self, mock_get_user, client):
+    async def test_logout(self, client, authenticate):
         """Test user logout"""
-        mock_get_user.return_value = {
-            "user_id": "user-123",
-            "email": "test@example.com",
-            "name": "Test User"
-        }
+        authenticate(UserClaims(
+            user_id=USER_ID,
+            email="test@example.com",
+            name="Test User"
+        ))
         
-        response = client.post("/api/v1/auth/logout")
+        response = await client.post("/api/v1/auth/logout")
         
         assert response.status_code == 200
         assert "logged out" in response.json()["message"]
\ No newline at end of file
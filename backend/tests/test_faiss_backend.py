@@ -0,0 +1,97 @@
+"""
+Tests for the in-process FAISS vector backend
+"""
+
+import pytest
+
+pytest.importorskip("faiss")
+
+from app.services.faiss_backend import FaissVectorBackend
+
+
+@pytest.fixture
+def index():
+    """Empty 3-dimensional index"""
+    return FaissVectorBackend(3)
+
+
+class TestFaissVectorBackend:
+    """Test the Pinecone-compatible subset used by VectorService"""
+    
+    def test_upsert_and_query(self, index):
+        """Test nearest neighbours are ranked by cosine similarity"""
+        index.upsert([
+            {"id": "a", "values": [1.0, 0.0, 0.0], "metadata": {"entity_type": "agent"}},
+            {"id": "b", "values": [0.0, 2.0, 0.0], "metadata": {"entity_type": "post"}},
+        ])
+        
+        response = index.query(vector=[3.0, 0.1, 0.0], top_k=2)
+        
+        assert [match.id for match in response.matches] == ["a", "b"]
+        assert response.matches[0].score == pytest.approx(0.9994, abs=1e-3)
+        assert response.matches[0].metadata == {"entity_type": "agent"}
+        assert index.describe_index_stats().total_vector_count == 2
+    
+    def test_upsert_replaces_existing_id(self, index):
+        """Test upserting an existing ID replaces its vector and metadata"""
+        index.upsert([{"id": "a", "values": [1.0, 0.0, 0.0], "metadata": {"version": 1}}])
+        index.upsert([{"id": "a", "values": [0.0, 1.0, 0.0], "metadata": {"version": 2}}])
+        
+        response = index.query(vector=[0.0, 1.0, 0.0], top_k=5)
+        
+        assert [match.id for match in response.matches] == ["a"]
+        assert response.matches[0].score == pytest.approx(1.0)
+        assert response.matches[0].metadata == {"version": 2}
+        assert index.fetch(["a"]).vectors["a"].values == pytest.approx([0.0, 1.0, 0.0])
+        assert index.describe_index_stats().total_vector_count == 1
+    
+    def test_upsert_duplicate_ids_keeps_last(self, index):
+        """Test a repeated ID within one batch is stored once with its last values"""
+        index.upsert([
+            {"id": "a", "values": [1.0, 0.0, 0.0], "metadata": {"version": 1}},
+            {"id": "a", "values": [0.0, 1.0, 0.0], "metadata": {"version": 2}},
+        ])
+        
+        response = index.query(vector=[0.0, 1.0, 0.0], top_k=5)
+        
+        assert [match.id for match in response.matches] == ["a"]
+        assert response.matches[0].metadata == {"version": 2}
+        assert index.fetch(["a"]).vectors["a"].values == pytest.approx([0.0, 1.0, 0.0])
+        assert index.describe_index_stats().total_vector_count == 1
+    
+    def test_delete(self, index):
+        """Test deleted IDs are gone and unknown IDs are ignored"""
+        index.upsert([
+            {"id": "a", "values": [1.0, 0.0, 0.0]},
+            {"id": "b", "values": [0.0, 1.0, 0.0]},
+        ])
+        
+        index.delete(["a", "missing"])
+        
+        assert index.fetch(["a", "b"]).vectors.keys() == {"b"}
+        assert [match.id for match in index.query(vector=[1.0, 0.0, 0.0]).matches] == ["b"]
+        assert index.query(id="a").matches == []
+    
+    def test_query_with_filter(self, index):
+        """Test metadata filters are applied before top_k is counted"""
+        index.upsert([
+            {"id": "post-1", "values": [1.0, 0.0, 0.0], "metadata": {"entity_type": "post"}},
+            {"id": "post-2", "values": [0.9, 0.1, 0.0], "metadata": {"entity_type": "post"}},
+            {"id": "agent-1", "values": [0.0, 0.0, 1.0], "metadata": {"entity_type": "agent"}},
+        ])
+        
+        response = index.query(vector=[1.0, 0.0, 0.0], top_k=1, filter={"entity_type": "agent"})
+        
+        assert [match.id for match in response.matches] == ["agent-1"]
+    
+    def test_query_by_stored_id(self, index):
+        """Test querying by ID searches from the stored vector"""
+        index.upsert([
+            {"id": "a", "values": [1.0, 0.0, 0.0]},
+            {"id": "b", "values": [1.0, 1.0, 0.0]},
+        ])
+        
+        response = index.query(id="b", top_k=1, include_metadata=False)
+        
+        assert response.matches[0].id == "b"
+        assert response.matches[0].metadata == {}
\ No newline at end of file